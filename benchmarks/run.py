@@ -0,0 +1,158 @@
+"""Scaling benchmarks of the SITH pipeline
+
+Times the parsing of a reference .fchk file (Extractor._extract), the expansion of its packed Hessian
+(LTMatrix.full_mat), the assembly of the RIC changes (SITH._populate_q), the energy analysis (SITH.analyze) and the
+output of the results (SithWriter.write_all) on synthetic inputs over a grid of atom, RIC and deformation counts. Each
+measurement is the best of several runs and is compared to the stored baselines, any operation slower than its baseline
+by more than the tolerance is reported as a regression.
+
+Usage, from the repository root with SITH installed or src on the PYTHONPATH:
+    python -m benchmarks.run                    compare the quick grid to benchmarks/baselines.json
+    python -m benchmarks.run --grid full        include the large cases which exercise the O(D^2) and O(D^3) paths
+    python -m benchmarks.run --save             store the measurements as the new baselines
+
+Baselines depend on the machine they were measured on, store them again after changing machines.
+"""
+import argparse
+import io
+import json
+import platform
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from SITH import SithWriter
+from SITH.SITH import SITH
+from SITH.Utilities import Extractor, LTMatrix
+from benchmarks.synthetic import write_fchk_set
+
+GRIDS = {'quick': [(10, 30, 10), (25, 120, 25), (50, 300, 50)],
+         'full': [(10, 30, 10), (25, 120, 25), (50, 300, 50), (100, 900, 100), (200, 2000, 50)]}
+"""(atoms, RICs, deformations) of each case, by grid"""
+
+BASELINES = Path(__file__).parent / 'baselines.json'
+
+MIN_DIFFERENCE = 1e-3
+"""Smallest slowdown in seconds reported as a regression, shorter times are dominated by noise"""
+
+
+def case_name(nAtoms: int, nRICs: int, nDeformed: int) -> str:
+    return f"atoms={nAtoms},rics={nRICs},deformed={nDeformed}"
+
+
+def best_of(function, repeat: int, setup=None) -> float:
+    """Best wall time of repeat calls of function, each preceded by an untimed call of setup.
+
+    Args:
+        function (Callable): called with the return value of setup, if any
+        repeat (int): number of timed calls
+        setup (Callable, optional): prepares the argument of each call. Defaults to None.
+
+    Returns:
+        float: shortest time in seconds
+    """
+    times = list()
+    for _ in range(repeat):
+        arguments = () if setup is None else (setup(),)
+        start = time.perf_counter()
+        function(*arguments)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def run_case(nAtoms: int, nRICs: int, nDeformed: int, repeat=3) -> dict:
+    """Times every operation on one synthetic input.
+
+    Args:
+        nAtoms (int): number of atoms
+        nRICs (int): number of RICs
+        nDeformed (int): number of deformed geometries
+        repeat (int, optional): number of timed runs of each operation. Defaults to 3.
+
+    Returns:
+        dict: best time in seconds by operation
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        reference, deformed = write_fchk_set(Path(directory), nAtoms, nRICs, nDeformed)
+        text = reference.read_text()
+        packed = list(np.asarray(Extractor.read_hessian(reference, np.float64, True).packed))
+
+        sith = SITH(reference, deformed)
+        sith.extract_data()
+        sith.analyze()
+        return {'extract': best_of(lambda extractor: extractor._extract(), repeat,
+                                   lambda: Extractor(reference, io.StringIO(text))),
+                'full_mat': best_of(lambda matrix: matrix.full_mat, repeat, lambda: LTMatrix(packed)),
+                'populate_q': best_of(lambda _: sith._populate_q(), repeat, lambda: None),
+                'analyze': best_of(lambda _: sith.analyze(), repeat, lambda: None),
+                'write_all': best_of(lambda _: SithWriter.write_all(sith), repeat, lambda: None)}
+
+
+def compare(results: dict, baselines: dict, tolerance: float) -> list:
+    """Finds the operations slower than their baseline by more than the tolerance.
+
+    Args:
+        results (dict): times by operation by case
+        baselines (dict): stored times by operation by case
+        tolerance (float): largest accepted ratio of time to baseline
+
+    Returns:
+        list[str]: description of each regression
+    """
+    regressions = list()
+    for case, times in results.items():
+        for operation, seconds in times.items():
+            baseline = baselines.get(case, dict()).get(operation)
+            if baseline is not None and seconds > tolerance * baseline and seconds - baseline > MIN_DIFFERENCE:
+                regressions.append(f"{case} {operation}: {seconds:.4f} s, baseline {baseline:.4f} s " +
+                                   f"({seconds / baseline:.2f}x)")
+    return regressions
+
+
+def report(results: dict, baselines: dict) -> str:
+    """Table of the times of each case, with the ratio to the baseline where there is one."""
+    lines = [f"{'Case':<36}{'Operation':<12}{'Seconds':>12}{'Baseline':>12}{'Ratio':>8}"]
+    for case, times in results.items():
+        for operation, seconds in times.items():
+            baseline = baselines.get(case, dict()).get(operation)
+            lines.append(f"{case:<36}{operation:<12}{seconds:>12.4f}" + (
+                f"{baseline:>12.4f}{seconds / baseline:>8.2f}" if baseline else f"{'-':>12}{'-':>8}"))
+    return '\n'.join(lines)
+
+
+def main(argv=None) -> int:
+    """Runs the benchmarks, returns 1 if any operation regressed."""
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.run', description="Scaling benchmarks of SITH.")
+    parser.add_argument('--grid', choices=sorted(GRIDS), default='quick', help="cases to run (default: quick)")
+    parser.add_argument('--repeat', type=int, default=3, help="timed runs of each operation (default: 3)")
+    parser.add_argument('--tolerance', type=float, default=1.5,
+                        help="largest accepted ratio of time to baseline (default: 1.5)")
+    parser.add_argument('--baselines', type=Path, default=BASELINES, help="baselines file")
+    parser.add_argument('--save', action='store_true', help="store the measurements as baselines")
+    args = parser.parse_args(argv)
+
+    stored = json.loads(args.baselines.read_text()) if args.baselines.exists() else {'cases': dict()}
+    results = dict()
+    for nAtoms, nRICs, nDeformed in GRIDS[args.grid]:
+        results[case_name(nAtoms, nRICs, nDeformed)] = run_case(nAtoms, nRICs, nDeformed, args.repeat)
+    print(report(results, stored['cases']))
+
+    if args.save:
+        stored['cases'].update(results)
+        stored['machine'] = {'platform': platform.platform(), 'processor': platform.processor(),
+                             'python': platform.python_version(), 'numpy': np.__version__}
+        args.baselines.write_text(json.dumps(stored, indent=2, sort_keys=True) + '\n')
+        print(f"Baselines stored in {args.baselines}")
+        return 0
+
+    regressions = compare(results, stored['cases'], args.tolerance)
+    for regression in regressions:
+        print("Regression: " + regression)
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,156 @@
+"""Generates synthetic Gaussian-style .fchk files of any size for the benchmarks
+
+The files hold the sections read by SITH.Utilities.Extractor (number of atoms, atomic numbers, total energy, cartesian
+coordinates, redundant internal dimensions, indices and coordinates, and internal force constants) in the layout of
+formatted checkpoint files written by Gaussian, so that they are parsed exactly like real input. The values are random
+but reproducible for a given seed: the Hessian is symmetric and diagonally dominant, and every deformation changes the
+RICs of the reference by a larger random strain than the one before it.
+"""
+from pathlib import Path
+from typing import Tuple
+
+import numpy as np
+
+ELEMENTS = (1, 6, 7, 8)
+"""Atomic numbers the synthetic atoms are drawn from"""
+
+
+def _scalar(name: str, kind: str, value) -> str:
+    if kind == 'R':
+        return f"{name:<40}   R{value:>27.15E}\n"
+    return f"{name:<40}   {kind}{value:>17}\n"
+
+
+def _array(name: str, kind: str, values) -> str:
+    values = np.asarray(values).ravel()
+    perLine, template = (6, '{:12d}') if kind == 'I' else (5, '{:16.8E}')
+    lines = [f"{name:<40}   {kind}   N={len(values):>12}\n"]
+    for start in range(0, len(values), perLine):
+        lines.append(''.join(template.format(value) for value in values[start:start + perLine].tolist()) + '\n')
+    return ''.join(lines)
+
+
+def dof_counts(nRICs: int) -> Tuple[int, int, int]:
+    """Splits a number of RICs into bond lengths, bond angles and dihedral angles, in roughly equal parts.
+
+    Args:
+        nRICs (int): number of RICs
+
+    Returns:
+        Tuple[int, int, int]: number of bond lengths, bond angles and dihedral angles
+    """
+    return (nRICs - 2 * (nRICs // 3), nRICs // 3, nRICs // 3)
+
+
+def random_dofs(nAtoms: int, nRICs: int, rng: np.random.Generator) -> np.ndarray:
+    """Draws distinct DOFs over nAtoms atoms.
+
+    Args:
+        nAtoms (int): number of atoms, at least 4
+        nRICs (int): number of DOFs
+        rng (np.random.Generator): random number generator
+
+    Returns:
+        np.ndarray: (nRICs, 4) atom indices (from 1) of the bond lengths, bond angles and then dihedral angles, zero-padded
+    """
+    assert nAtoms >= 4, "At least 4 atoms are needed for dihedral angles."
+    counts = dof_counts(nRICs)
+    assert counts[0] <= nAtoms * (nAtoms - 1) // 2, "More bond lengths requested than there are pairs of atoms."
+    dofs = np.zeros((nRICs, 4), dtype=int)
+    row = 0
+    for size, count in zip((2, 3, 4), counts):
+        drawn = set()
+        while len(drawn) < count:
+            atoms = tuple(int(atom) for atom in rng.choice(nAtoms, size, replace=False) + 1)
+            # the same DOF read backwards is not a different DOF
+            drawn.add(min(atoms, atoms[::-1]))
+        dofs[row:row + count, :size] = sorted(drawn)
+        row += count
+    return dofs
+
+
+def random_hessian(nRICs: int, rng: np.random.Generator) -> np.ndarray:
+    """Draws a symmetric, diagonally dominant Hessian.
+
+    Returns:
+        np.ndarray: lower triangle of the Hessian, packed row by row as in the .fchk file
+    """
+    packed = rng.uniform(-0.01, 0.01, nRICs * (nRICs + 1) // 2) / max(nRICs, 1)
+    diagonal = np.arange(1, nRICs + 1) * (np.arange(1, nRICs + 1) + 1) // 2 - 1
+    packed[diagonal] = rng.uniform(0.1, 0.6, nRICs)
+    return packed
+
+
+def fchk_text(atomicNumbers: np.ndarray, positions: np.ndarray, dofs: np.ndarray, rics: np.ndarray,
+              energy: float, hessian: np.ndarray) -> str:
+    """Formats the sections of a .fchk file.
+
+    Args:
+        atomicNumbers (np.ndarray): atomic number of each atom
+        positions (np.ndarray): (atoms, 3) cartesian coordinates in Bohr
+        dofs (np.ndarray): (RICs, 4) zero-padded atom indices of each RIC, bond lengths first, then angles, then dihedrals
+        rics (np.ndarray): value of each RIC, in Bohr and radians
+        energy (float): total energy in Hartrees
+        hessian (np.ndarray): packed lower triangle of the Hessian, None leaves the Internal Force Constants section out
+
+    Returns:
+        str: contents of the .fchk file
+    """
+    sizes = np.count_nonzero(dofs, axis=1)
+    dims = [len(dofs)] + [int(np.count_nonzero(sizes == size)) for size in (2, 3, 4)]
+    return ''.join(["Synthetic SITH benchmark geometry\n",
+                    "Freq      RB3LYP                                                      6-31G(d)\n",
+                    _scalar("Number of atoms", 'I', len(atomicNumbers)),
+                    _scalar("Charge", 'I', 0),
+                    _scalar("Multiplicity", 'I', 1),
+                    _array("Atomic numbers", 'I', atomicNumbers),
+                    _array("Current cartesian coordinates", 'R', positions),
+                    _array("Redundant internal dimensions", 'I', dims),
+                    _array("Redundant internal coordinate indices", 'I', dofs),
+                    _array("Redundant internal coordinates", 'R', rics),
+                    _scalar("Total Energy", 'R', energy)] +
+                   ([] if hessian is None else [_array("Internal Force Constants", 'R', hessian)]))
+
+
+def write_fchk_set(directory: Path, nAtoms: int, nRICs: int, nDeformed: int, seed=0,
+                   deformedHessians=False) -> Tuple[Path, Path]:
+    """Writes a reference .fchk file and a directory of deformed .fchk files sharing its DOFs.
+
+    Args:
+        directory (Path): directory in which 'x0.fchk' and the 'deformed' directory are written
+        nAtoms (int): number of atoms
+        nRICs (int): number of RICs (DOFs)
+        nDeformed (int): number of deformed geometries
+        seed (int, optional): seed of the random values. Defaults to 0.
+        deformedHessians (bool, optional): write the Hessian into the deformed files too. SITH.analyze() only uses the
+        reference Hessian, so by default they are left out, which keeps large cases from writing gigabytes of input.
+        Defaults to False.
+
+    Returns:
+        Tuple[Path, Path]: reference file and deformed directory
+    """
+    rng = np.random.default_rng(seed)
+    directory = Path(directory)
+    deformedDirectory = directory / 'deformed'
+    deformedDirectory.mkdir(parents=True, exist_ok=True)
+
+    atomicNumbers = rng.choice(ELEMENTS, nAtoms)
+    positions = rng.uniform(-10., 10., (nAtoms, 3))
+    dofs = random_dofs(nAtoms, nRICs, rng)
+    nBonds, nAngles, _ = dof_counts(nRICs)
+    rics = np.concatenate((rng.uniform(1.8, 3.0, nBonds), rng.uniform(1.5, 2.5, nAngles),
+                           rng.uniform(-np.pi, np.pi, nRICs - nBonds - nAngles)))
+    hessian = random_hessian(nRICs, rng)
+    deformedHessian = hessian if deformedHessians else None
+
+    reference = directory / 'x0.fchk'
+    reference.write_text(fchk_text(atomicNumbers, positions, dofs, rics, -100., hessian))
+    for i in range(1, nDeformed + 1):
+        strain = 0.01 * i * rng.standard_normal(nRICs)
+        deformed = rics + strain
+        # dihedral angles stay within (-pi, pi], as in Gaussian output, so that some of them wrap around
+        deformed[nBonds + nAngles:] = np.angle(np.exp(1j * deformed[nBonds + nAngles:]))
+        (deformedDirectory / f'x{i:04d}.fchk').write_text(fchk_text(
+            atomicNumbers, positions + 0.01 * i * rng.standard_normal((nAtoms, 3)), dofs, deformed,
+            -100. + 0.5 * strain @ strain, deformedHessian))
+    return reference, deformedDirectory
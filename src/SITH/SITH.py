@@ -1,10 +1,76 @@
 """Calculates & houses SITH analysis data."""
+import io
+import logging
+import os
 import sys
+import time
+from contextlib import nullcontext
+from copy import copy
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from itertools import chain, repeat
 from typing import Tuple
 import pathlib
 from pathlib import Path
 import numpy as np
-from SITH.Utilities import Extractor, Geometry
+from SITH.Utilities import Extractor, Geometry, GeometryCache, PackedHessian, PhaseTimer, SparseHessian, TimedReader, \
+    load_mapped, write_mapped
+
+logger = logging.getLogger(__name__)
+
+
+def _extract_geometry(path: Path, dtype, packedHessian: bool, emptyMessage: str, cacheDir=None,
+                      readHessian=True) -> Tuple[Geometry, PhaseTimer]:
+    """Streams and extracts a single .fchk file into a Geometry.
+
+    The file is consumed line by line by the Extractor, so only one file is ever being read at a time. Module level so that
+    it can be sent to the worker processes of SITH.extract_data(), which is why the time spent is returned rather than
+    recorded on the SITH object: reading from disk and fingerprinting or loading a cache entry are recorded as 'read', the
+    remaining extraction time as 'parse', and storing a cache entry as 'write'.
+
+    Args:
+        path (Path): .fchk file to extract
+        dtype (numpy.dtype): floating point precision of the extracted RICs and Hessian
+        packedHessian (bool): keep the Hessian in packed lower triangular storage
+        emptyMessage (str): assertion message if the file is empty
+        cacheDir (Path, optional): GeometryCache directory from which the geometry is loaded if the file is unchanged, and
+        into which it is stored otherwise. Defaults to None, which always parses the file.
+        readHessian (bool, optional): parse the Hessian, if False it is only read from the file on first access to the
+        Geometry's hessian. Defaults to True.
+
+    Returns:
+        Tuple[Geometry, PhaseTimer]: extracted geometry and the time spent extracting it
+    """
+    timings = PhaseTimer()
+    if cacheDir is not None:
+        cache = GeometryCache(cacheDir)
+        with timings.phase('read', items=1, nbytes=path.stat().st_size):
+            fingerprint = GeometryCache.fingerprint(path, dtype)
+            geometry = cache.load(path, dtype, packedHessian, fingerprint, readHessian)
+        if geometry is not None:
+            if not readHessian:
+                geometry.load_hessian_lazily(partial(
+                    Extractor.read_hessian, path, dtype, packedHessian, cache.index_path(path)))
+            return geometry, timings
+
+    start = time.perf_counter()
+    with TimedReader(path.open('rb', buffering=0)) as reader, io.TextIOWrapper(io.BufferedReader(reader)) as file:
+        firstLine = file.readline()
+        assert len(firstLine) > 0, emptyMessage
+        extractor = Extractor(path, chain(
+            [firstLine], file), dtype, packedHessian, readHessian)
+        extractor._extract()
+    geometry = extractor.get_geometry()
+    timings.add('read', reader.seconds, reader.bytes, items=1)
+    timings.add('parse', time.perf_counter() - start - reader.seconds, items=1)
+    if cacheDir is not None:
+        with timings.phase('write', items=1):
+            cache.store(path, geometry, fingerprint, readHessian)
+    if not readHessian:
+        # with a cache, the section index of the file is stored next to its entry so the Hessian is read by seeking to it
+        geometry.load_hessian_lazily(partial(Extractor.read_hessian, path, dtype, packedHessian,
+                                             None if cacheDir is None else cache.index_path(path)))
+    return geometry, timings
 
 
 class SITH:
@@ -19,16 +85,27 @@ class SITH:
         deformationEnergy (numpy.ndarray[float]): Total stress energy per deformation [deformation index]
     """
 
-    def __init__(self, rePath='', dePath=''):
+    def __init__(self, rePath='', dePath='', dtype=np.float64, packedHessian=False):
         """Initializes a SITH object
 
         Args:
             rePath (str, optional): reference geometry .fchk file path. Defaults to ''.
             dePath (str, optional): deformed geometry .fchk file path or path to directory 
             of deformed geometries .fchk files. Defaults to ''.
+            dtype (numpy.dtype, optional): floating point precision used end-to-end for RICs, the Hessian and all analysis
+            results, either numpy.float64 for accuracy or numpy.float32 for half the memory. Defaults to numpy.float64.
+            packedHessian (bool, optional): store Hessians as SITH.Utilities.PackedHessian (lower triangle only) instead of
+            full matrices. Defaults to False.
         """
         self._workingPath = Path.cwd()
 
+        self._dtype = np.dtype(dtype)
+        """numpy.dtype: Floating point precision of RICs, Hessian, and analysis results"""
+        assert self._dtype in (np.float32, np.float64), "Precision must be either numpy.float32 or numpy.float64."
+
+        self._packedHessian = packedHessian
+        """bool: Whether Hessians are kept in packed lower triangular storage rather than expanded to full matrices"""
+
         self._referencePath = None
         """Path to reference geometry, specified on SITH construction"""
 
@@ -65,6 +142,12 @@ class SITH:
         """np.ndarray[float]: Percentage of stress energy in each degree of freedom to the each structure's total stress energy 
         in the form [DOF index, deformation index]
         
+        Note:
+            While this may be publicly accessed, please refrain from manually setting this value as it is an analysis result."""
+        self.hessianCutoffError = None
+        """np.ndarray[float]: Upper bound on the absolute error in deformationEnergy introduced by the Hessian cutoff of a sparse
+        analysis, [1, deformation index]. None if the full Hessian was used.
+
         Note:
             While this may be publicly accessed, please refrain from manually setting this value as it is an analysis result."""
 
@@ -115,11 +198,25 @@ class SITH:
         """list[int]: atom indices of atoms to be removed from reference geometry, hessian, and analysis"""
         self._killDOFs = list()
         """list[Tuple]: Tuples of DOFs (by involved atom indices to be removed) from reference geometry, hessian, and analysis"""
+        self._killChanged = False
+        """bool: Whether the atoms or DOFs to remove changed since they were last applied to the extracted data."""
+        self._extracted = None
+        """Tuple[Geometry, list[Geometry]]: Reference and deformed geometries as extracted, before any DOFs were removed, None prior to extract_data()."""
+
+        self._chunkSize = None
+        """int: Number of deformations analyzed per block in chunked mode, None analyzes all deformations at once."""
+        self._outDir = None
+        """pathlib.Path: Directory in which chunked analysis results are stored as memory-mapped .npy files, None keeps them in memory."""
+
+        self.timings = PhaseTimer()
+        """SITH.Utilities.PhaseTimer: Wall time, bytes read or written, and items processed by each phase of this SITH object:
+        read, parse, kill, align, validate, populate_q, analyze, and write (by SithWriter). Phases which run again, such as
+        the setup after a change of the atoms or DOFs to kill, accumulate."""
 
         # endregion
 
         self._validate_files()
-        print("Successfully initialized SITH object with given input files...")
+        logger.debug("Successfully initialized SITH object with given input files...")
 
 # region Atomic Homicide
 
@@ -127,31 +224,43 @@ class SITH:
         """
         Executes the removal of degrees of freedom (DOFs) specified and any associated with specified atoms.
 
+        The DOFs to remove are resolved into a single keep mask over the reference DOFs, which is applied to the reference
+        geometry and its Hessian at once. The deformed geometries are then aligned to the remaining reference DOFs by
+        SITH.remove_extra_dofs(), which applies the same selection to them.
+
         Warning:
             This is a private method to limit user error. Specification of these DOFs is made by the user programmatically with the public functions set_kill_atoms(atoms: list)
-            and set_kill_dofs(dofs: list) prior to data extraction by calling SITH.extract_data(). If no mismatch between
-            number of DOFs in each geometry's coordinates and Hessian, this can be manually called after extract_data()
-            as well but is not recommended.
-        """
-        print("Killing atoms and degrees of freedom...")
-        self.__kill_dofs(self._killDOFs)
-        dimsToKill = list()
-        for atom in self._killAtoms:
-            dimsToKill.extend(
-                [dim for dim in self._reference.dim_indices if atom in dim])
-        self.__kill_dofs(dimsToKill)
-        print("Atoms and DOFs killed...")
-
-    def __kill_dofs(self, dofs: list[Tuple]):
-        """
-        Removes the indicated degrees of freedom from the JEDI analysis, as such it removes them from the geometries' RICs
-        as well as from the Hessian matrix.
-        """
-        rIndices = list()
-        for dof in dofs:
-            rIndices.extend([i for i in range(self._reference.dims[0])
-                            if self._reference.dim_indices[i] == dof])
-        self._reference._kill_DOFs(rIndices)
+            and set_kill_dofs(dofs: list), before or after SITH.extract_data(). It is only called by SITH._apply_kill() on
+            shallow copies of the extracted geometries, so that the extracted data is never modified.
+        """
+        logger.debug("Killing atoms and degrees of freedom...")
+        with self.timings.phase('kill') as record:
+            keep = self._kill_mask(self._reference, self._killAtoms, self._killDOFs)
+            record['items'] += len(keep) - np.count_nonzero(keep)
+            self._reference._keep_DOFs(keep)
+        logger.debug("Atoms and DOFs killed...")
+
+    @staticmethod
+    def _kill_mask(geometry: Geometry, atoms: list, dofs: list[Tuple]) -> np.ndarray:
+        """
+        Resolves DOFs and atoms to remove into a keep mask over the DOFs of geometry.
+
+        Args:
+            geometry (Geometry): geometry whose DOFs are masked
+            atoms (list): atoms whose DOFs are removed
+            dofs (list[Tuple]): DOFs which are removed
+
+        Returns:
+            np.ndarray[bool]: False for each DOF which is in dofs or involves one of atoms, True otherwise
+        """
+        keep = np.ones(geometry.dims[0], dtype=bool)
+        rows = geometry.dof_index.rows(dofs)
+        keep[rows[rows >= 0]] = False
+        if len(atoms) > 0:
+            # atom indices of each DOF are padded with 0, which is never a valid atom index
+            indices = geometry.dim_indices_array
+            keep &= ~np.any(np.isin(indices, atoms) & (indices != 0), axis=1)
+        return keep
 
 # endregion
 
@@ -171,7 +280,8 @@ class SITH:
     def hessian(self) -> np.ndarray:
         """Hessian matrix used to calculate the change in stress energy during SITH.analysis().
         
-        Default value is that of the reference Geometry's Hessian.
+        Default value is that of the reference Geometry's Hessian. If the SITH object was constructed with packedHessian=True,
+        this is a SITH.Utilities.PackedHessian, which supports the same products (hessian @ deltaQ) as a numpy.ndarray.
 
         Note:
             Hessian matrix is the analytical gradient of the harmonic potential energy surface at a reference geometry as calculated
@@ -194,13 +304,14 @@ class SITH:
             Any atoms in the deformed geometries not present
             in the reference geometry are automatically removed during extraction.
 
-        Warning:
-            This must be set prior to calling SITH.extract_data().
+            If set after SITH.extract_data(), the next call to SITH.analyze() removes the atoms from the data as extracted,
+            without reading the input files again.
         """
 
         self._killAtoms = atoms
         self._kill = True
-        print("Atoms to be killed are set...")
+        self._killChanged = True
+        logger.debug("Atoms to be killed are set...")
 
     def set_kill_dofs(self, dofs: list[Tuple]):
         """Marks which DOFs in the reference geometry should be removed during data extraction.
@@ -212,81 +323,265 @@ class SITH:
             Any atoms in the deformed geometries not present
             in the reference geometry are automatically removed during extraction.
 
-        Warning:
-            This must be set prior to calling SITH.extract_data().
+            If set after SITH.extract_data(), the next call to SITH.analyze() removes the DOFs from the data as extracted,
+            without reading the input files again.
         """        
         self._killDOFs = dofs
         self._kill = True
-        print("DOFs to be killed are set...")
+        self._killChanged = True
+        logger.debug("DOFs to be killed are set...")
+
+    def set_chunking(self, chunkSize: int, outDir=''):
+        """Enables chunked analysis, processing the deformations in blocks of chunkSize columns.
+
+        In chunked mode the deformed geometries are extracted, aligned and validated a block of chunkSize files at a time, and
+        each block fills its columns of qF and deltaQ before its geometries are compacted (SITH.Utilities.Geometry.compact()).
+        SITH.analyze() then fills energies, pEnergies and deformationEnergy block by block. The geometries being worked on are
+        therefore bounded by the chunk size rather than by the number of deformations N.
 
-    def remove_extra_dofs(self):       
+        The remaining O(N) cost is one compact Geometry per deformation (its name, energy and dims, its atoms are read
+        from its file on access), and the five D x N results qF, deltaQ, energies, pEnergies and deformationEnergy. Only
+        with an output directory are those results memory-mapped, keeping peak memory independent of N.
+
+        Args:
+            chunkSize (int): number of deformations per block.
+            outDir (str, optional): directory, relative to the working directory, in which the results are stored as
+            memory-mapped .npy files. Defaults to '', which keeps the results in memory, O(D x N).
+
+        Warning:
+            This must be set prior to calling SITH.extract_data().
+        """
+        assert int(chunkSize) > 0, "Chunk size must be a positive number of deformations."
+        self._chunkSize = int(chunkSize)
+        if outDir == '':
+            self._outDir = None
+        else:
+            self._outDir = self._workingPath / outDir
+            self._outDir.mkdir(parents=True, exist_ok=True)
+        logger.debug("Chunked analysis is set...")
+
+    def remove_extra_dofs(self, deformed: list[Geometry] = None):       
         """
-        Removes any DOFs in the deformed geometry which are not in the reference geometry.
+        Aligns the DOFs of the deformed geometries to those of the reference geometry.
 
-        Ensures that deformed geometry data is compatible with analysis based on the reference geometry and its Hessian.
+        The RICs (and Hessians) of each deformed geometry are gathered into the order of the reference DOFs, which removes any
+        DOFs which are not in the reference geometry. Ensures that deformed geometry data is compatible with analysis based on
+        the reference geometry and its Hessian even if the deformed input files list the same DOFs in a different order.
 
         Warning:
-            If there are DOFs in the reference geometry that do not exist in the deformed geometry, it will mess up this method
+            If there are DOFs in the reference geometry that do not exist in the deformed geometry, alignment is not possible
             and indicates an issue with the calculation which must be fixed in the generation of input. 
             
             Solution: https://gaussian.com/gic/ specify Active GIC in deformed opt
-        """
-        print("Removing DOFs in the deformed geometries which are not present in the reference geometry...")
-        for deformation in self._deformed:
-            dofsToRemove = list()
-            for j in range(max(deformation.dims[0], self._reference.dims[0])):
-                if j < deformation.dims[0]:
-                    # deformed not in reference
-                    if deformation.dim_indices[j] not in list(self._reference.dim_indices):
-                        dofsToRemove.append(j)
-                if j < self._reference.dims[0]:  # reference not in deformed
-                    assert self._reference.dim_indices[j] in deformation.dim_indices, "Deformed geometry ("+deformation.name+") is missing reference DOF "+str(
-                        self._reference.dim_indices[j])+"."
 
-            deformation._kill_DOFs(dofsToRemove)
-
-    def extract_data(self):       
+        Args:
+            deformed (list[Geometry], optional): geometries to align. Defaults to None, which aligns all deformed geometries.
+        """
+        if deformed is None:
+            deformed = self._deformed
+        logger.debug("Aligning the DOFs of the deformed geometries to the reference geometry...")
+        with self.timings.phase('align', items=len(deformed)):
+            for deformation in deformed:
+                # row of each reference DOF in the deformed geometry
+                rows = deformation.dof_index.rows(self._reference.dim_indices_array)
+                missing = np.flatnonzero(rows < 0)
+                assert len(missing) == 0, "Deformed geometry ("+deformation.name+") is missing reference DOF "+str(
+                    self._reference.dim_indices[missing[0]])+"."
+                if len(rows) != deformation.dims[0] or np.any(rows != np.arange(len(rows))):
+                    deformation._reorder_DOFs(rows)
+
+    def extract_data(self, workers=1, cacheDir=None, hessianFile=None):       
         """
         Extracts, validates, and organizes data from input files. Removes any marked atoms and DOFs.  
 
+        Args:
+            workers (int, optional): number of processes parsing the deformed files concurrently, None uses all available
+            cores. Defaults to 1, which parses them sequentially in this process.
+            cacheDir (str, optional): directory, relative to the working directory, of a SITH.Utilities.GeometryCache. Files
+            which are unchanged since they were cached are loaded from it instead of being parsed, all others are parsed
+            and cached. Defaults to None, which always parses every file.
+            hessianFile (str, optional): .npy file, relative to the working directory, backing the reference Hessian. It is
+            written from the reference file, with the SHA-256 of the reference content in a .json file next to it, if it
+            does not exist or was written from other content, and is otherwise used without parsing the Hessian again. The
+            Hessian is then memory-mapped rather than held in memory, so that several SITH objects or processes share one
+            page-cached copy. Defaults to None, which keeps the Hessian in memory.
+
         Note:
-            Input files must be specified in SITH constructor, atoms and DOFs to remove previously must be specified by the user with
-            set_kill_atoms or set_kill_dofs.
+            Input files must be specified in SITH constructor. Atoms and DOFs to remove may be marked with set_kill_atoms or
+            set_kill_dofs before or after this call: they are removed from shallow copies of the extracted geometries, which
+            are kept intact, and marks changed afterwards are applied by the next analyze() without parsing the input files
+            again.
         Warning:
             This method must always be called prior to analyze() to extract and set up
             the relevant data."""
-        print("Beginning data extraction...")
-        self._get_contents()
-
-        rExtractor = Extractor(self._referencePath, self._rData)
-        rExtractor._extract()
+        logger.info("Beginning data extraction...")
+        if cacheDir is not None:
+            cacheDir = self._workingPath / cacheDir
+        mappedHessian = None
+        if hessianFile is not None:
+            hessianFile = self._workingPath / hessianFile
+            # keyed to the content of the reference, so that a file shared by references of the same size, or left from
+            # an earlier version of the reference, is never used for another one
+            hessianKey = {'sha256': GeometryCache.fingerprint(self._referencePath, self._dtype)['sha256']}
+            mappedHessian = self._load_mapped_hessian(hessianFile, hessianKey)
         # Create Geometry objects from reference and deformed data
-        self._reference = rExtractor.get_geometry()
-        self._deformed = list()
-        for dd in self._dData:
-            dExtractor = Extractor(dd[0], dd[1])
-            dExtractor._extract()
-            self._deformed.append(dExtractor.get_geometry())
+        self._reference, timings = _extract_geometry(self._referencePath, self._dtype, self._packedHessian,
+                                                     "Reference data file is empty.", cacheDir, mappedHessian is None)
+        self.timings.merge(timings)
+        if hessianFile is not None:
+            self._map_hessian(hessianFile, hessianKey, mappedHessian)
+        dPaths = self._get_deformed_paths()
+
+        if workers is None:
+            workers = os.cpu_count()
+        assert workers > 0, "Number of workers must be positive."
+        self._workers = workers
+        self._cacheDir = cacheDir
+        if self._chunkSize is None:
+            with self._pool(len(dPaths)) as pool:
+                self._deformed = self._extract_deformed(dPaths, pool)
+        else:
+            # the deformed geometries are extracted block by block while setting up, see _setup_chunked()
+            self._deformed = None
+
+        logger.info("Finished data extraction...")
+        self._extracted = (self._reference, self._deformed)
+        self._apply_kill()
 
-        print("Finished data extraction...")
+    def _pool(self, nFiles: int):
+        """Process pool extracting nFiles deformed files with the workers given to extract_data(), or a null context if
+        they are extracted in this process."""
+        if self._workers == 1 or nFiles == 1:
+            return nullcontext()
+        logger.info("Extracting deformed geometries with " + str(self._workers) + " processes...")
+        return ProcessPoolExecutor(max_workers=self._workers)
+
+    def _extract_deformed(self, dPaths: list[Path], pool=None) -> list[Geometry]:
+        """Extracts deformed geometries, in the order of dPaths.
+
+        Args:
+            dPaths (list[Path]): deformed .fchk files
+            pool (ProcessPoolExecutor, optional): pool extracting the files concurrently. Defaults to None, which extracts
+            them in this process.
+
+        Returns:
+            list[Geometry]: extracted geometries
+        """
+        # only the reference Hessian is used in the analysis, those of the deformed geometries are read on first access
+        arguments = (dPaths, repeat(self._dtype), repeat(self._packedHessian),
+                     repeat("One or more deformed files are empty."), repeat(self._cacheDir), repeat(False))
+        if pool is None:
+            extracted = list(map(_extract_geometry, *arguments))
+        else:
+            # map returns the geometries in the order of dPaths
+            extracted = list(pool.map(_extract_geometry, *arguments,
+                                      chunksize=max(1, len(dPaths) // (4 * self._workers))))
+        for _, timings in extracted:
+            self.timings.merge(timings)
+        return [geometry for geometry, _ in extracted]
+
+    def _apply_kill(self):
+        """
+        Sets up the reference and deformed geometries for analysis from the data as extracted, with the atoms and DOFs
+        currently marked for removal removed, and populates the q vectors.
+
+        Removal works on shallow copies whose arrays are replaced rather than modified, so the extracted data is left intact
+        and a different set of atoms or DOFs can be removed later without parsing the input files again.
+        """
+        self._reference = copy(self._extracted[0])
+        if self._chunkSize is None:
+            self._deformed = [copy(deformation) for deformation in self._extracted[1]]
 
         # Defaults to the reference geometry Hessian, it is recommended to make new SITH objects for each new analysis for the
         # sake of clearer output files but implementation of SITH.set_reference() as a public function would enable the user to
         # manually swap the reference geometry with that of another geometry in the deformd list and then re-run analysis.
 
         # Killing of atoms should occur here prior to validation for the sake of DOF # atoms consistency, as well as before
-        # populating the q vectors to ensure that no data which should be ignored leaks into the analysis
+        # populating the q vectors to ensure that no data which should be ignored leaks into the analysis. It runs again on
+        # fresh copies whenever the atoms or DOFs to kill change after extraction, see _refresh_kill()
         if self._kill:
             self.__kill()
 
-        self.remove_extra_dofs()
+        if self._chunkSize is None:
+            self.remove_extra_dofs()
+            self._validate_geometries()
+            self._populate_q()
+        else:
+            # the deformed files are read again, only compacted geometries are kept from the last setup
+            self._setup_chunked()
+        self._killChanged = False
+        logger.debug("Finished setting up for energy analysis...")
 
-        self._validate_geometries()
+    def _setup_chunked(self):
+        """
+        Extracts, aligns and validates the deformed geometries a block of SITH._chunkSize files at a time, filling their
+        columns of qF and deltaQ, and compacts each block before the next one is extracted.
+        """
+        self._populate_q0()
+        dPaths = self._get_deformed_paths()
+        nDOFs = self._reference.dims[0]
+        self.qF = self._allocate('qF', (nDOFs, len(dPaths)))
+        self.deltaQ = self._allocate('deltaQ', (nDOFs, len(dPaths)))
+        self._deformed = list()
+        with self._pool(len(dPaths)) as pool:
+            for start in range(0, len(dPaths), self._chunkSize):
+                stop = min(start + self._chunkSize, len(dPaths))
+                block = self._extract_deformed(dPaths[start:stop], pool)
+                self.remove_extra_dofs(block)
+                self._validate_geometries(block)
+                with self.timings.phase('populate_q', items=len(block)):
+                    self._fill_q(self.qF[:, start:stop], self.deltaQ[:, start:stop], block)
+                for deformation in block:
+                    deformation.compact()
+                self._deformed += block
+        if self._outDir is not None:
+            self.qF.flush()
+            self.deltaQ.flush()
+
+    def _load_mapped_hessian(self, hessianFile: Path, key: dict):
+        """
+        Opens the memory-mapped reference Hessian if it was written from the current content of the reference file and
+        matches the precision and storage of this SITH object.
+
+        Args:
+            hessianFile (Path): .npy file backing the reference Hessian
+            key (dict): SHA-256 of the content of the reference file, see SITH.Utilities.load_mapped()
 
-        self._populate_q()
-        print("Finished setting up for energy analysis...")
+        Returns:
+            numpy.memmap: read-only reference Hessian (the packed lower triangle if packedHessian), None if it must be written.
+        """
+        hessian = load_mapped(hessianFile, key)
+        if hessian is None or hessian.dtype != self._dtype or hessian.ndim != (1 if self._packedHessian else 2):
+            return None
+        return hessian
 
-    def analyze(self):
+    def _map_hessian(self, hessianFile: Path, key: dict, hessian=None):
+        """
+        Replaces the reference Hessian by its memory-mapped copy in hessianFile, writing the file first, with the key of
+        the reference content, if hessian is None or does not match the reference DOFs.
+        """
+        nDOFs = self._reference.dims[0]
+        if hessian is not None and hessian.shape != ((nDOFs * (nDOFs + 1) // 2,) if self._packedHessian else (nDOFs, nDOFs)):
+            # a file of another size cannot hold the Hessian of this reference, it is read again and the file rewritten
+            hessian = None
+            self._reference.hessian = Extractor.read_hessian(self._referencePath, self._dtype, self._packedHessian)
+        if hessian is None:
+            assert self._reference.hessian is not None, "Reference data file does not contain a Hessian."
+            source = self._reference.hessian.packed if self._packedHessian else np.asarray(
+                self._reference.hessian)
+            hessianFile.parent.mkdir(parents=True, exist_ok=True)
+
+            def fill(mapped):
+                mapped[:] = source
+
+            hessian = write_mapped(hessianFile, self._dtype, source.shape, fill, key)
+        if self._packedHessian:
+            hessian = PackedHessian(hessian, self._dtype)
+        assert hessian.shape == (self._reference.dims[0], self._reference.dims[0]), \
+            "Memory-mapped Hessian does not match the reference DOFs."
+        self._reference.hessian = hessian
+
+    def analyze(self, hessianCutoff=None):
         """
         Performs the SITH energy analysis, populates energies, deformationEnergy, and pEnergies.
 
@@ -294,30 +589,135 @@ class SITH:
         (analytical gradient of the harmonic potential energy surface) to produce both the total calculated change in energy
         between the reference structure and each deformed structure (SITH.deformationEnergy) as well as the subdivision of that energy into
         each DOF (SITH.energies).
+
+        Args:
+            hessianCutoff (float, optional): if given, the analysis uses a sparse Hessian (SITH.Utilities.SparseHessian) without the
+            off-diagonal force constants smaller in magnitude than this cutoff, and populates hessianCutoffError with a bound on the
+            resulting error in deformationEnergy. Requires scipy. Defaults to None, which uses the full Hessian.
         """
-        print("Performing energy analysis...")
-        if self.deltaQ is None or self.q0 is None or self.qF is None:
+        logger.info("Performing energy analysis...")
+        self._refresh_kill()
+        if self.q0 is None or self.deltaQ is None or self.qF is None:
             raise Exception(
                 "Populate Q has not been executed so necessary data for analysis is lacking. This is likely due to not calling extract_data().")
-        self.energies = np.zeros(
-            (self.reference.dims[0], len(self._deformed)))
-        self.deformationEnergy = np.zeros((1, len(self._deformed)))
-        self.pEnergies = np.zeros(
-            (self._reference.dims[0], len(self._deformed)))
-
-        for i in range(len(self._deformed)):
-            self.deformationEnergy[0, i] = 0.5 * np.transpose(self.deltaQ[:, i]).dot(
-                self._reference.hessian).dot(self.deltaQ[:, i])  # scalar 1x1 total Energy
-            for j in range(self._reference.dims[0]):
-                isolatedDOF = np.hstack((np.zeros(j), self.deltaQ[j, i], np.zeros(
-                    self._reference.dims[0]-j-1)))
-                self.energies[j, i] = 0.5 * \
-                    (isolatedDOF).dot(self._reference.hessian).dot(
-                        self.deltaQ[:, i])
-            self.pEnergies[:, i] = float(
-                100) * self.energies[:, i] / self.deformationEnergy[0, i]
-
-        print("Execute Order 67. Successful energy analysis completed.")
+        start = time.perf_counter()
+        hessian = self._reference.hessian
+        if hessianCutoff is not None:
+            hessian = SparseHessian(hessian, hessianCutoff)
+            logger.info("Using sparse Hessian with " + str(hessian.matrix.nnz) + " of " +
+                        str(hessian.dimension**2) + " force constants...")
+
+        if self._chunkSize is None:
+            self.energies, self.deformationEnergy, self.pEnergies = self._stress_energies(
+                self.deltaQ, hessian)
+        else:
+            self._analyze_chunked(hessian)
+
+        self.hessianCutoffError = None if hessianCutoff is None else hessian.error_bound(
+            self.deltaQ)
+        self.timings.add('analyze', time.perf_counter() - start, items=len(self._deformed))
+
+        logger.info("Execute Order 67. Successful energy analysis completed.")
+        logger.debug("Phase timings:\n" + self.timings.report())
+
+    def analyze_scenarios(self, scenarios: list[list]) -> Tuple:
+        """
+        Performs the SITH energy analysis for several sets of excluded DOFs at once.
+
+        Each scenario excludes its DOFs from the analysis as if they had been killed: their changes are left out of the
+        product with the Hessian and their energies are 0. All scenarios are evaluated with a single product of the Hessian
+        and the masked deltaQ of every scenario side by side, reusing deltaQ and the Hessian of this SITH object.
+
+        Args:
+            scenarios (list[list]): DOFs to exclude in each scenario, given as tuples of atom indices and/or as atom indices,
+            in which case every DOF involving the atom is excluded. E.g. [[(1, 2)], [5, 6], [3, (1, 2, 4)]]
+
+        Returns:
+            Tuple: (energies [scenario index, DOF index, deformation index], deformationEnergy [scenario index, deformation index])
+
+        Note:
+            The DOFs removed by set_kill_atoms() and set_kill_dofs() are removed in every scenario. In chunked mode (see
+            set_chunking()) the scenarios are evaluated on blocks of deltaQ of the chunk size.
+        """
+        logger.info("Performing energy analysis of " + str(len(scenarios)) + " scenarios...")
+        self._refresh_kill()
+        if self.deltaQ is None:
+            raise Exception(
+                "Populate Q has not been executed so necessary data for analysis is lacking. This is likely due to not calling extract_data().")
+        nDOFs, nDeformed = self.deltaQ.shape
+        # in chunked mode deltaQ is read and the scenarios are evaluated a block of deformations at a time
+        blockSize = nDeformed if self._chunkSize is None else self._chunkSize
+        energies = np.empty((len(scenarios), nDOFs, nDeformed), dtype=self._dtype)
+        with self.timings.phase('analyze', items=len(scenarios) * nDeformed):
+            keep = np.ones((len(scenarios), nDOFs), dtype=self._dtype)
+            for i, scenario in enumerate(scenarios):
+                keep[i] = self._kill_mask(self._reference, [atom for atom in scenario if np.ndim(atom) == 0],
+                                          [dof for dof in scenario if np.ndim(dof) == 1])
+            for start in range(0, nDeformed, blockSize):
+                stop = min(start + blockSize, nDeformed)
+                # masked deltaQ of each scenario side by side: [DOF index, scenario index * block size + deformation index]
+                deltaQ = (keep[:, :, np.newaxis] * np.asarray(self.deltaQ[:, start:stop])[np.newaxis]).transpose(
+                    1, 0, 2).reshape((nDOFs, len(scenarios) * (stop - start)))
+                block = 0.5 * deltaQ * (self._reference.hessian @ deltaQ)
+                energies[:, :, start:stop] = block.reshape((nDOFs, len(scenarios), stop - start)).transpose(1, 0, 2)
+        return (energies, energies.sum(axis=1))
+
+    def _refresh_kill(self):
+        """Applies the atoms and DOFs to kill again if they changed since extract_data()."""
+        if self._killChanged and self._extracted is not None:
+            logger.info("Atoms or DOFs to kill changed, setting up again from the extracted data...")
+            self._apply_kill()
+
+    def _analyze_chunked(self, hessian):
+        """Performs the energy analysis in blocks of SITH._chunkSize deformations.
+
+        Args:
+            hessian: Hessian matrix with which to calculate the stress energies
+
+        The outputs are preallocated (as memory-mapped .npy files if an output directory was given to set_chunking()) and
+        each block of deltaQ, filled by _setup_chunked(), is analyzed and written before the next block is started.
+        """
+        nDOFs, nDeformed = self.deltaQ.shape
+        self.energies = self._allocate('energies', (nDOFs, nDeformed))
+        self.pEnergies = self._allocate('pEnergies', (nDOFs, nDeformed))
+        self.deformationEnergy = self._allocate(
+            'deformationEnergy', (1, nDeformed))
+
+        for start in range(0, nDeformed, self._chunkSize):
+            stop = min(start + self._chunkSize, nDeformed)
+            deltaQ = np.asarray(self.deltaQ[:, start:stop])
+            self.energies[:, start:stop], self.deformationEnergy[:, start:stop], self.pEnergies[:, start:stop] = self._stress_energies(
+                deltaQ, hessian)
+
+        if self._outDir is not None:
+            for result in (self.energies, self.pEnergies, self.deformationEnergy):
+                result.flush()
+
+    def _allocate(self, name: str, shape: Tuple) -> np.ndarray:
+        """Preallocates an analysis result, backed by '<name>.npy' in the chunked output directory if one was set."""
+        if self._outDir is None:
+            return np.zeros(shape, dtype=self._dtype)
+        return np.lib.format.open_memmap(self._outDir / (name + '.npy'), mode='w+', dtype=self._dtype, shape=shape)
+
+    def _stress_energies(self, deltaQ: np.ndarray, hessian) -> Tuple:
+        """Calculates the stress energies of a block of deformations in a single batched product.
+
+        The energy in DOF j of deformation i is 0.5 * deltaQ[j, i] * (H @ deltaQ)[j, i], so all DOFs of all
+        deformations are obtained from one Hessian product and an element-wise multiplication, and the total
+        stress energy of each deformation is the sum over its DOFs (0.5 * deltaQ[:, i] . H . deltaQ[:, i]).
+
+        Args:
+            deltaQ (np.ndarray): changes in RICs [DOF index, deformation index]
+            hessian: Hessian matrix (numpy.ndarray, PackedHessian or SparseHessian)
+
+        Returns:
+            Tuple: (energies [DOF index, deformation index], deformationEnergy [1, deformation index],
+            pEnergies [DOF index, deformation index])
+        """
+        energies = 0.5 * deltaQ * (hessian @ deltaQ)
+        deformationEnergy = np.sum(energies, axis=0, keepdims=True)
+        pEnergies = float(100) * energies / deformationEnergy
+        return (energies, deformationEnergy, pEnergies)
 
     def set_reference(self, geometryName: str):
         """
@@ -350,41 +750,44 @@ class SITH:
         """
         Check that all files exist and whether the deformed path is a directory
         """
-        print("Validating input files...")
+        logger.debug("Validating input files...")
         assert self._referencePath.exists(), "Path to reference geometry data does not exist."
         assert self._deformedPath.exists(), "Path to deformed geometry data does not exist."
 
         self.__deformedIsDirectory = self._deformedPath.is_dir()
 
-    def _validate_geometries(self):
+    def _validate_geometries(self, deformed: list[Geometry] = None):
         """
         Ensure that the reference and deformed geometries are compatible(# atoms, # dofs, etc.)
+
+        Args:
+            deformed (list[Geometry], optional): geometries to validate. Defaults to None, which validates all deformed geometries.
         """
-        print("Validating geometries...")
-        assert all([deformn.n_atoms == self._reference.n_atoms and np.array_equal(deformn.dims, self._reference.dims) and np.array_equal(
-            deformn.dim_indices, self._reference.dim_indices) for deformn in self._deformed]), "Incompatible number of atoms or dimensions amongst input files."
+        if deformed is None:
+            deformed = self._deformed
+        logger.debug("Validating geometries...")
+        with self.timings.phase('validate', items=len(deformed)):
+            assert all([deformn.n_atoms == self._reference.n_atoms and np.array_equal(deformn.dims, self._reference.dims) and np.array_equal(
+                deformn.dim_indices_array, self._reference.dim_indices_array) for deformn in deformed]), "Incompatible number of atoms or dimensions amongst input files."
 
 # endregion
 
     def _get_contents(self):
         """
         Gets the contents of the input files, including those in a deformed directory and verifies they are not empty.
+
+        Note:
+            This holds every input file in memory at once in _rData and _dData. SITH.extract_data() does not use it and
+            instead streams one file at a time into its Extractor.
         """
-        print("Retrieving file contents...")
+        logger.debug("Retrieving file contents...")
         try:
             with self._referencePath.open() as rFile:
                 self._rData = rFile.readlines()
                 assert len(self._rData) > 0, "Reference data file is empty."
 
             self._dData = list()
-            if self.__deformedIsDirectory:
-                dPaths = list(sorted(self._deformedPath.glob('*.fchk')))
-                dPaths = [pathlib.Path(dp) for dp in dPaths]
-            else:
-                dPaths = [self._deformedPath]
-
-            assert len(dPaths) > 0, "Deformed directory is empty."
-            for dp in dPaths:
+            for dp in self._get_deformed_paths():
                 with dp.open() as dFile:
                     dLines = dFile.readlines()
                     assert len(
@@ -396,27 +799,64 @@ class SITH:
             # stack trace
             raise
         except:
-            print(
+            logger.exception(
                 "An exception occurred during the extraction of the input files' contents.")
             sys.exit(sys.exc_info()[0])
 
+    def _get_deformed_paths(self) -> list[Path]:
+        """
+        Gets the paths of the deformed geometry files, sorted by name if the deformed path is a directory.
+        """
+        if self.__deformedIsDirectory:
+            dPaths = list(sorted(self._deformedPath.glob('*.fchk')))
+            dPaths = [pathlib.Path(dp) for dp in dPaths]
+        else:
+            dPaths = [self._deformedPath]
+
+        assert len(dPaths) > 0, "Deformed directory is empty."
+        return dPaths
+
     def _populate_q(self):
         """Populates the reference RIC vector q0, deformed RIC matrix qF, and a matrix deltaQ containing the changes in RICs."""
-        print("Populating RIC vectors and calculating \u0394q...")
-        self.q0 = np.zeros((self._reference.dims[0], 1))
-        self.qF = np.zeros((self._reference.dims[0], 1))
+        logger.debug("Populating RIC vectors and calculating \u0394q...")
+        with self.timings.phase('populate_q', items=len(self._deformed)):
+            self._populate_q0()
+            # qF columns correspond to each deformed geometry, the rows correspond to the degrees of freedom
+            # qF[DOF index, row or deformed geometry index] -> value of DOF for deformed geometry at index of self.deformed
+            self.qF = np.empty((self._reference.dims[0], len(self._deformed)), dtype=self._dtype)
+            self.deltaQ = np.empty_like(self.qF)
+            self._fill_q(self.qF, self.deltaQ, self._deformed)
+
+    def _populate_q0(self):
+        """Populates the reference RIC vector q0."""
+        self.q0 = np.zeros((self._reference.dims[0], 1), dtype=self._dtype)
         self.q0[:, 0] = np.transpose(np.asarray(self._reference.ric))
-        # qF columns correspond to each deformed geometry, the rows correspond to the degrees of freedom
-        # qF[DOF index, row or deformed geometry index] -> value of DOF for deformed geometry at index of self.deformed
-        self.qF[:, 0] = np.transpose(np.asarray(self._deformed[0].ric))
-        if len(self._deformed) > 1:
-            for i in range(1, len(self._deformed)):
-                deformation = self._deformed[i]
-                temp = np.transpose(np.asarray(deformation.ric))
-                self.qF = np.column_stack((self.qF, temp))
-            # delta_q is organized in the same shape as qF
-        self.deltaQ = np.subtract(self.qF, self.q0)
 
+    def _fill_q(self, qF: np.ndarray, deltaQ: np.ndarray, deformed: list[Geometry]):
+        """Fills preallocated columns of qF and deltaQ with the RICs of the given deformed geometries and their changes from q0.
+
+        Args:
+            qF (np.ndarray): RIC values to fill [DOF index, deformation index], one column per deformed geometry
+            deltaQ (np.ndarray): changes in RIC values to fill, same shape as qF
+            deformed (list[Geometry]): deformed geometries in the order of the columns
+        """
+        for i, deformation in enumerate(deformed):
+            qF[:, i] = deformation.ric
+        np.subtract(qF, self.q0, out=deltaQ)
+        self._wrap_angles(deltaQ, self._reference.offsets[1])
+
+    @staticmethod
+    def _wrap_angles(deltaQ: np.ndarray, nBonds=0) -> np.ndarray:
+        """Wraps changes in angles and dihedrals which cross the periodic boundary, in place.
+
+        Args:
+            deltaQ (np.ndarray): changes in RICs [DOF index, deformation index]
+            nBonds (int, optional): number of bond lengths, which are the first rows of deltaQ and are never wrapped.
+            Defaults to 0.
+
+        Returns:
+            np.ndarray: the wrapped deltaQ
+        """
         """This adjustment is to account for cases where dihedral angles oscillate about 180 degrees or pi and, since the 
         coordinate system in Gaussian for example is from pi to -pi, where k and l are small, it shows up as 
         -   -(pi-k) - (pi - l) = -2pi + (k+l) should be: -(k + l) 
@@ -424,12 +864,9 @@ class SITH:
         +   (pi - k) - -(pi - l) = 2pi - (k+l) should be (k+l)
                 --> -(result - 2pi) = 2pi - result
         """
-        with np.nditer(self.deltaQ, op_flags=['readwrite']) as dqit:
-            for dq in dqit:
-                #         dq[...] = np.abs(dq - 2*np.pi) if dq > (2*np.pi -
-                #                                                 0.005) else (dq + 2*np.pi if dq < -(2*np.pi - 0.005) else dq)
-                if dq > np.pi:
-                    blah = 3
-                dq[...] = 2*np.pi - \
-                    dq if dq > np.pi else (-(dq + 2*np.pi)
-                                           if dq < -np.pi else dq)
+        angles = deltaQ[nBonds:]
+        above = angles > np.pi
+        below = angles < -np.pi
+        angles[above] = 2*np.pi - angles[above]
+        angles[below] = -(angles[below] + 2*np.pi)
+        return deltaQ
@@ -1,12 +1,41 @@
 """Contains methods which format, organize, and output data from SITH objects"""
+from functools import wraps
+import logging
+from pathlib import Path
 from typing import Tuple
 
 import numpy as np
 from ase.io import write
+from ase.units import Bohr
 
 from SITH.SITH import SITH
 from SITH.Utilities import Geometry, UnitConverter
 
+logger = logging.getLogger(__name__)
+
+
+def _timed_write(output: str):
+    """Records each call of the decorated write function as a run of the 'write' phase of the SITH object's timings,
+    counting the bytes of the output it wrote.
+
+    Args:
+        output (str): name of the file or directory written, which is prefixed by filePrefix in the parent directory of
+        the reference structure
+    """
+    def decorator(function):
+        @wraps(function)
+        def timed(sith: SITH, filePrefix='', *args, **kwargs):
+            with sith.timings.phase('write', items=1) as record:
+                success = function(sith, filePrefix, *args, **kwargs)
+            path = Path(sith._referencePath.parent.as_posix()+sith._referencePath.root+filePrefix+output)
+            if success and path.is_dir():
+                record['bytes'] += sum(file.stat().st_size for file in path.iterdir())
+            elif success and path.exists():
+                record['bytes'] += path.stat().st_size
+            return success
+        return timed
+    return decorator
+
 
 #region: Write
 def write_all(sith: SITH, filePrefix='') -> bool:
@@ -26,6 +55,7 @@ def write_all(sith: SITH, filePrefix='') -> bool:
     return write_summary(sith, filePrefix) and write_delta_q(sith, filePrefix) and write_dof_energies(sith, filePrefix) and write_error(sith, filePrefix)
 
 
+@_timed_write('summary.txt')
 def write_summary(sith: SITH, filePrefix='', includeXYZ=False) -> bool:
     """Write 'summary.txt' file of sith analysis  in the parent directory of the reference structure.
 
@@ -69,14 +99,15 @@ def write_summary(sith: SITH, filePrefix='', includeXYZ=False) -> bool:
                       "summary.txt", geometry.atoms, format='xyz', append=True, comment=geometry.name)
         return True
     except IOError as e:
-        print(e)
+        logger.error(e)
         return False
     except e:
-        print("Non-IO Exception encountered:")
-        print(e)
+        logger.error("Non-IO Exception encountered:")
+        logger.error(e)
         return False
 
 
+@_timed_write('total_energies.txt')
 def write_total_energies(sith: SITH, filePrefix='') -> bool:
     """Writes the change in energy per structure to 'total_energies.txt'
      in the parent directory of the reference structure.
@@ -97,14 +128,15 @@ def write_total_energies(sith: SITH, filePrefix='') -> bool:
             dq.write('\n')
         return True
     except IOError as e:
-        print(e)
+        logger.error(e)
         return False
     except e:
-        print("Non-IO Exception encountered:")
-        print(e)
+        logger.error("Non-IO Exception encountered:")
+        logger.error(e)
         return False
 
 
+@_timed_write('delta_q.txt')
 def write_delta_q(sith: SITH, filePrefix='') -> bool:
     """Writes the change in Redundant Internal Coordinates (RICs) per structure to 'delta_q.txt' 
     in the parent directory of the reference structure.
@@ -125,14 +157,15 @@ def write_delta_q(sith: SITH, filePrefix='') -> bool:
             dq.write('\n')
         return True
     except IOError as e:
-        print(e)
+        logger.error(e)
         return False
     except e:
-        print("Non-IO Exception encountered:")
-        print(e)
+        logger.error("Non-IO Exception encountered:")
+        logger.error(e)
         return False
 
 
+@_timed_write('error.txt')
 def write_error(sith: SITH, filePrefix='') -> bool:
     """Writes error information to 'error.txt' in the parent directory of the reference structure.
 
@@ -152,14 +185,15 @@ def write_error(sith: SITH, filePrefix='') -> bool:
             dq.write('\n')
         return True
     except IOError as e:
-        print(e)
+        logger.error(e)
         return False
     except e:
-        print("Non-IO Exception encountered:")
-        print(e)
+        logger.error("Non-IO Exception encountered:")
+        logger.error(e)
         return False
 
 
+@_timed_write('dof_energies.txt')
 def write_dof_energies(sith: SITH, filePrefix='') -> bool:
     """Writes the energy in each degree of freedom (RIC) per deformed geometry.
 
@@ -180,11 +214,63 @@ def write_dof_energies(sith: SITH, filePrefix='') -> bool:
             dq.write('\n')
         return True
     except IOError as e:
-        print(e)
+        logger.error(e)
         return False
     except e:
-        print("Non-IO Exception encountered:")
-        print(e)
+        logger.error("Non-IO Exception encountered:")
+        logger.error(e)
+        return False
+
+
+@_timed_write('summary.sith')
+def write_binary_summary(sith: SITH, filePrefix='') -> bool:
+    """Writes the results of sith analysis as a binary summary, the 'summary.sith' directory in the parent directory of the
+    reference structure, holding one .npy file per array.
+
+    The arrays are those of the text summary, in the same units (Angstroms, degrees, and Hartrees), so that
+    SITH.Utilities.SummaryReader gives the same results for either summary, but each is memory-mapped on first access
+    instead of parsing formatted text:
+        dim_indices: (DOF, 4) atom indices of each DOF, zero-padded
+        dims: number of DOFs, bond lengths, bond angles and dihedral angles
+        deltaQ: change in each DOF [DOF, deformation]
+        energies: stress energy in each DOF [DOF, deformation]
+        deformationEnergy: total stress energy [1, deformation]
+        accuracy: stress energy, expected stress energy, %Error and Error [4, deformation]
+        positions: cartesian coordinates of the reference and deformed structures [structure, atom, 3]
+        atomic_numbers: atomic numbers of the atoms
+        names: names of the reference and deformed structures
+
+    Args:
+        sith (SITH): analyzed SITH object
+        filePrefix (str, optional): prefix for file output. Defaults to ''.
+
+    Returns:
+        bool: True if successful
+    """
+    assert sith.deformationEnergy is not None, "SITH.analyze() has not been performed yet, no summary information available."
+    expectedDE, errorDE, pErrorDE = calculate_error(sith)
+    dims = sith._reference.dims
+    deltaQ = np.array(sith.deltaQ, dtype=float)
+    deltaQ[:dims[1]] = deltaQ[:dims[1]] * Bohr
+    deltaQ[dims[1]:] = np.degrees(deltaQ[dims[1]:])
+    structures = [sith._reference] + list(sith._deformed)
+    arrays = {'dim_indices': sith._reference.dim_indices_array,
+              'dims': np.array(dims),
+              'deltaQ': deltaQ,
+              'energies': np.asarray(sith.energies),
+              'deformationEnergy': np.asarray(sith.deformationEnergy),
+              'accuracy': np.concatenate((sith.deformationEnergy, expectedDE, pErrorDE, errorDE)),
+              'positions': np.array([structure.atoms.positions for structure in structures]),
+              'atomic_numbers': sith._reference.atoms.get_atomic_numbers(),
+              'names': np.array([structure.name for structure in structures])}
+    try:
+        directory = Path(sith._referencePath.parent.as_posix()+sith._referencePath.root+filePrefix+"summary.sith")
+        directory.mkdir(exist_ok=True)
+        for name, values in arrays.items():
+            np.save(directory / (name + '.npy'), values, allow_pickle=False)
+        return True
+    except IOError as e:
+        logger.error(e)
         return False
 
 
@@ -1,11 +1,157 @@
 from array import array
+from contextlib import contextmanager
+import hashlib
+import io
+from itertools import islice
+import json
+import logging
+import math
+import os
 from pathlib import Path
 import pathlib
+import time
+from typing import Tuple
 from ase import Atoms, Atom
-from ase.data import chemical_symbols
 from ase.units import Bohr
 import numpy as np
 
+logger = logging.getLogger(__name__)
+
+
+def _atomic_write(path: Path, writer):
+    """Writes a file under a temporary name and only then moves it into place.
+
+    Other processes sharing the file therefore never read one which exists but is not completely written yet.
+
+    Args:
+        path (Path): file to write
+        writer (Callable): called with the temporary path, writes the whole file there
+    """
+    path = Path(path)
+    temporary = path.with_name(path.name + '.' + str(os.getpid()) + '.tmp')
+    writer(temporary)
+    os.replace(temporary, path)
+
+
+def _file_stamp(path: Path) -> list:
+    """Size, modification time (ns) and inode of a file, which all survive os.replace() but change when it is rewritten."""
+    stat = Path(path).stat()
+    return [stat.st_size, stat.st_mtime_ns, stat.st_ino]
+
+
+def _key_path(path: Path) -> Path:
+    """.json file next to a .npy file holding the key it was written with, see write_mapped()."""
+    return Path(path).with_name(Path(path).name + '.json')
+
+
+def write_mapped(path: Path, dtype, shape: Tuple, fill, key=None) -> np.memmap:
+    """Writes a .npy file through a memory map and opens it read-only, see _atomic_write().
+
+    Args:
+        path (Path): .npy file to write
+        dtype (numpy.dtype): type of the values
+        shape (Tuple): shape of the array
+        fill (Callable): called with the writable memory-mapped array, fills it in place
+        key (optional): JSON serializable key of the content, stored next to the file together with its stamp so that
+        load_mapped() only opens the file written with it. Defaults to None, which stores no key.
+
+    Returns:
+        np.memmap: read-only memory-mapped array
+    """
+    stamp = list()
+
+    def writer(temporary):
+        mapped = np.lib.format.open_memmap(temporary, mode='w+', dtype=dtype, shape=shape)
+        fill(mapped)
+        mapped.flush()
+        del mapped
+        # stamped before it is moved into place, so the key can never describe a file written by another process
+        stamp.extend(_file_stamp(temporary))
+
+    _atomic_write(path, writer)
+    if key is not None:
+        def keyWriter(temporary):
+            with temporary.open('w') as file:
+                json.dump({'key': key, 'file': stamp}, file)
+
+        _atomic_write(_key_path(path), keyWriter)
+    return np.load(path, mmap_mode='r')
+
+
+def load_mapped(path: Path, key) -> np.memmap:
+    """Opens a .npy file written by write_mapped() read-only if it was written with the given key.
+
+    Args:
+        path (Path): .npy file
+        key: JSON serializable key of the expected content
+
+    Returns:
+        np.memmap: read-only memory-mapped array, None if the file does not exist or was not written with key
+    """
+    path = Path(path)
+    if not path.exists() or not _key_path(path).exists():
+        return None
+    with _key_path(path).open() as file:
+        stored = json.load(file)
+    if stored['key'] != key:
+        return None
+    mapped = np.load(path, mmap_mode='r')
+    # stamped after opening, a file replaced since the key was read no longer matches it
+    if _file_stamp(path) != stored['file']:
+        return None
+    return mapped
+
+
+def _mapped_selection(source: np.memmap, kept: np.ndarray, shape: Tuple, fill) -> np.memmap:
+    """Opens the memory-mapped .npy file holding the selection of the kept DOFs of a memory-mapped Hessian.
+
+    The file is created next to the source file, named after the kept DOFs so that it can be shared by every process
+    using the same selection, and is reused if it is newer than the source and has the expected shape and type.
+
+    Args:
+        source (np.memmap): memory-mapped Hessian (full matrix or packed lower triangle)
+        kept (np.ndarray): indices of the kept DOFs
+        shape (Tuple): shape of the selection
+        fill (Callable): called with the writable selection if it must be written, fills it in place
+
+    Returns:
+        np.memmap: read-only memory-mapped selection
+    """
+    sourcePath = Path(source.filename)
+    path = sourcePath.with_name(sourcePath.stem + '-' +
+                                hashlib.sha1(np.asarray(kept, dtype=np.int64).tobytes()).hexdigest()[:16] + '.npy')
+    if path.exists() and path.stat().st_mtime_ns >= sourcePath.stat().st_mtime_ns:
+        selection = np.load(path, mmap_mode='r')
+        if selection.shape == shape and selection.dtype == source.dtype:
+            return selection
+    return write_mapped(path, source.dtype, shape, fill)
+
+
+def delete_mapped(hessian: np.memmap, dof_indices: list[int]) -> np.memmap:
+    """Removes rows and columns from a memory-mapped Hessian without loading it into memory.
+
+    The reduced Hessian is written, a block of rows at a time, to a memory-mapped .npy file next to the original one.
+
+    Args:
+        hessian (np.memmap): memory-mapped full Hessian matrix
+        dof_indices (list[int]): indices of the DOFs to remove
+
+    Returns:
+        np.memmap: read-only memory-mapped reduced Hessian
+    """
+    keep = np.ones(len(hessian), dtype=bool)
+    keep[np.asarray(dof_indices, dtype=int)] = False
+    if keep.all():
+        return hessian
+    kept = np.flatnonzero(keep)
+
+    def fill(reduced):
+        rowsPerBlock = max(1, PackedHessian.block_elements // max(1, len(hessian)))
+        for start in range(0, len(kept), rowsPerBlock):
+            reduced[start:start + rowsPerBlock] = hessian[kept[start:start + rowsPerBlock]][:, kept]
+
+    return _mapped_selection(hessian, kept, (len(kept), len(kept)), fill)
+
 
 class LTMatrix(list):
     """LTMatrix class and code adapted to PEP8 style but from https://github.com/ruixingw/rxcclib/blob/dev/utils/my/LTMatrix.py"""
@@ -76,29 +222,27 @@ class LTMatrix(list):
         """
         build full matrix (np.ndarray).
         """
-        L = []
-        for i in range(self.dimension):
-            L.append([])
-            for j in range(self.dimension):
-                L[-1].append(self[i, j])
-        self._fullmat = np.array(L)
+        elements = np.asarray(self.list)
+        self._fullmat = np.zeros((self.dimension, self.dimension), dtype=elements.dtype)
+        rows, columns = np.tril_indices(self.dimension)
+        self._fullmat[rows, columns] = elements
+        self._fullmat[columns, rows] = elements
         return self._fullmat
 
     @property
     def full_mat(self):
         """
-        Return the full matrix (np.ndarray)
+        Return the full matrix (np.ndarray), built once and cached.
         """
-        return getattr(self, '_fullmat', self.build_full_mat())
+        if getattr(self, '_fullmat', None) is None:
+            self.build_full_mat()
+        return self._fullmat
 
     def inverse(self):
         return np.linalg.inv(self.full_mat)
 
     def uppermat(self):
-        up = []
-        for i, row in enumerate(self.full_mat):
-            up.extend(row[i:])
-        return up
+        return list(self.full_mat[np.triu_indices(self.dimension)])
 
     @staticmethod
     def new_from_upper_mat(uppermat):
@@ -113,37 +257,343 @@ class LTMatrix(list):
         R5                20
         """
         dimension = LTMatrix.get_row_column(len(uppermat)-1)[0] + 1
+        full = np.zeros((dimension, dimension), dtype=np.asarray(uppermat).dtype)
+        full[np.triu_indices(dimension)] = uppermat
+        # the lower triangle read row by row is the upper triangle read column by column
+        return LTMatrix(list(full.T[np.tril_indices(dimension)]))
+
+
+class PackedHessian:
+    """Symmetric Hessian matrix kept in packed lower triangular storage, as it is given in the .fchk file.
+
+    Only the lower triangle (row by row, including the diagonal) is held in a single NumPy buffer, which halves the memory
+    of the full matrix. Products with vectors and matrices as well as removal of DOFs are performed directly on the packed
+    storage, expanding at most a bounded block of rows at a time.
+    """
+
+    block_elements = 2**22
+    """Maximum number of matrix elements expanded at once during products."""
+
+    def __init__(self, packed, dtype=np.float64) -> None:
+        """Initializes a PackedHessian
+
+        Args:
+            packed (list): elements of the lower triangular matrix, row by row.
+            dtype (numpy.dtype, optional): floating point precision of the stored elements. Defaults to numpy.float64.
+        """
+        self.packed = np.asanyarray(packed, dtype=dtype)
+        """Lower triangular elements of the Hessian, row by row"""
+        i, j = LTMatrix.get_row_column(len(self.packed) - 1)
+        assert i == j, "Not a LTMatrix"
+        self.dimension = i + 1
+        """Number of rows (and columns) of the Hessian"""
+
+    @property
+    def shape(self) -> Tuple:
+        return (self.dimension, self.dimension)
+
+    @property
+    def dtype(self) -> np.dtype:
+        return self.packed.dtype
+
+    @property
+    def full_mat(self) -> np.ndarray:
+        """Expands the Hessian into a full symmetric matrix (np.ndarray)."""
+        full = np.zeros(self.shape, dtype=self.dtype)
+        rows, columns = np.tril_indices(self.dimension)
+        full[rows, columns] = self.packed
+        full[columns, rows] = self.packed
+        return full
+
+    def __array__(self, dtype=None, copy=None) -> np.ndarray:
+        return self.full_mat if dtype is None else self.full_mat.astype(dtype)
+
+    def _row_block(self, start: int, stop: int) -> np.ndarray:
+        """Expands rows [start, stop) of the lower triangle into a dense (stop - start) x stop block, zero above the diagonal."""
+        block = np.zeros((stop - start, stop), dtype=self.dtype)
+        lower = np.arange(stop)[np.newaxis, :] <= np.arange(start, stop)[:, np.newaxis]
+        block[lower] = self.packed[start * (start + 1) // 2: stop * (stop + 1) // 2]
+        return block
+
+    def dot(self, x: np.ndarray) -> np.ndarray:
+        """Symmetric product of the Hessian with a vector or matrix, computed from the packed storage.
+
+        Args:
+            x (np.ndarray): vector [DOF index] or matrix [DOF index, column]
+
+        Returns:
+            np.ndarray: H @ x, with the same shape as x
+        """
+        x = np.asarray(x)
+        assert x.shape[0] == self.dimension, "Mismatch between Hessian dimension and number of DOFs given."
+        columns = x.reshape(self.dimension, -1)
+        product = np.zeros(columns.shape, dtype=np.result_type(self.dtype, columns.dtype))
+        rowsPerBlock = max(1, self.block_elements // self.dimension)
+        for start in range(0, self.dimension, rowsPerBlock):
+            stop = min(start + rowsPerBlock, self.dimension)
+            block = self._row_block(start, stop)
+            # lower triangle and diagonal of rows [start, stop)
+            product[start:stop] += block @ columns[:stop]
+            # mirrored strictly lower triangle, i.e. the upper triangle of columns [start, stop)
+            block[np.arange(stop - start), np.arange(start, stop)] = 0
+            product[:stop] += block.T @ columns[start:stop]
+        return product.reshape(x.shape)
+
+    def __matmul__(self, x: np.ndarray) -> np.ndarray:
+        return self.dot(x)
+
+    def _gather(self, rows: np.ndarray, out: np.ndarray):
+        """Writes the packed lower triangle of the Hessian restricted to the given rows (and columns), in their order, into out."""
+        position = 0
+        for k, row in enumerate(rows):
+            upper = np.maximum(row, rows[:k + 1])
+            out[position:position + k + 1] = self.packed[upper * (upper + 1) // 2 + np.minimum(row, rows[:k + 1])]
+            position += k + 1
+
+    def take(self, rows: list[int]) -> 'PackedHessian':
+        """Selects and reorders DOFs of the Hessian.
+
+        Args:
+            rows (list[int]): indices of the DOFs to keep, in their new order
+
+        Returns:
+            PackedHessian: Hessian of the selected DOFs
+        """
+        rows = np.asarray(rows, dtype=int)
+        packed = np.empty(len(rows) * (len(rows) + 1) // 2, dtype=self.dtype)
+        self._gather(rows, packed)
+        return PackedHessian(packed, self.dtype)
+
+    def delete(self, dof_indices: list[int]) -> 'PackedHessian':
+        """Removes the rows and columns of the given DOFs directly on the packed storage.
+
+        Args:
+            dof_indices (list[int]): indices of the DOFs to remove
+
+        Returns:
+            PackedHessian: Hessian without the removed DOFs
+        """
+        keep = np.ones(self.dimension, dtype=bool)
+        keep[np.asarray(dof_indices, dtype=int)] = False
+        if keep.all():
+            return self
+        kept = np.flatnonzero(keep)
+        size = len(kept) * (len(kept) + 1) // 2
+        if isinstance(self.packed, np.memmap):
+            # memory-mapped storage stays on disk, see delete_mapped()
+            packed = _mapped_selection(self.packed, kept, (size,), lambda selection: self._gather(kept, selection))
+        else:
+            packed = np.empty(size, dtype=self.dtype)
+            self._gather(kept, packed)
+        return PackedHessian(packed, self.dtype)
+
+
+class SparseHessian:
+    """Symmetric Hessian matrix in compressed sparse row (CSR) storage, without the couplings smaller than a cutoff.
+
+    Diagonal force constants are always kept. The Frobenius norm of the dropped couplings is recorded so that the error
+    introduced in the stress energies can be bounded.
+
+    Note:
+        Requires scipy.
+    """
+
+    def __init__(self, hessian, cutoff: float) -> None:
+        """Initializes a SparseHessian
+
+        Args:
+            hessian (numpy.ndarray | PackedHessian | LTMatrix): Hessian matrix from which to build the sparse matrix.
+            cutoff (float): magnitude below which off-diagonal couplings are dropped.
+        """
+        try:
+            from scipy import sparse
+        except ImportError:
+            raise ImportError(
+                "Sparse Hessians require scipy, install it with 'pip install scipy'.")
+        assert cutoff >= 0, "Hessian cutoff must not be negative."
+        self.cutoff = cutoff
+        """Magnitude below which off-diagonal couplings were dropped"""
+
+        if isinstance(hessian, (PackedHessian, LTMatrix)):
+            packed = hessian.packed if isinstance(hessian, PackedHessian) else np.asarray(hessian.list)
+            i, j = LTMatrix.get_row_column(len(packed) - 1)
+            assert i == j, "Not a LTMatrix"
+            dimension = i + 1
+
+            def lower(start, stop):
+                return packed[start * (start + 1) // 2: stop * (stop + 1) // 2]
+        else:
+            full = np.asarray(hessian)
+            dimension = len(full)
+
+            def lower(start, stop):
+                return full[start:stop, :stop][np.arange(stop)[np.newaxis, :] <= np.arange(start, stop)[:, np.newaxis]]
+        self.dimension = dimension
+        """Number of rows (and columns) of the Hessian"""
+
+        # the lower triangle is thresholded a bounded block of rows at a time, only the kept elements are gathered
+        rows, columns, values = list(), list(), list()
+        droppedSquares = 0.
+        rowsPerBlock = max(1, PackedHessian.block_elements // self.dimension)
+        for start in range(0, self.dimension, rowsPerBlock):
+            stop = min(start + rowsPerBlock, self.dimension)
+            block = lower(start, stop)
+            # offsets in the block at which each of its rows ends, the last element of each row is its diagonal
+            ends = np.cumsum(np.arange(start + 1, stop + 1))
+            kept = np.abs(block) >= cutoff
+            kept[ends - 1] = True
+            droppedSquares += float(np.sum(np.square(block[~kept], dtype=np.float64)))
+            positions = np.flatnonzero(kept)
+            blockRows = np.searchsorted(ends, positions, side='right')
+            columns.append(positions - (ends[blockRows] - (blockRows + start + 1)))
+            rows.append(blockRows + start)
+            values.append(block[kept])
+        rows, columns, values = np.concatenate(rows), np.concatenate(columns), np.concatenate(values)
+
+        self.dropped_norm = float(np.sqrt(2 * droppedSquares))
+        """Frobenius norm of the dropped part of the (symmetric) Hessian"""
+
+        offDiagonal = rows != columns
+        self.matrix = sparse.coo_matrix((np.concatenate((values, values[offDiagonal])),
+                                         (np.concatenate((rows, columns[offDiagonal])),
+                                          np.concatenate((columns, rows[offDiagonal])))),
+                                        shape=(self.dimension, self.dimension)).tocsr()
+        """scipy.sparse.csr_matrix of the kept force constants"""
+
+    @property
+    def shape(self) -> Tuple:
+        return (self.dimension, self.dimension)
+
+    @property
+    def dtype(self) -> np.dtype:
+        return self.matrix.dtype
+
+    @property
+    def full_mat(self) -> np.ndarray:
+        """Expands the sparse Hessian into a full matrix (np.ndarray)."""
+        return self.matrix.toarray()
+
+    def __array__(self, dtype=None, copy=None) -> np.ndarray:
+        return self.full_mat if dtype is None else self.full_mat.astype(dtype)
+
+    def dot(self, x: np.ndarray) -> np.ndarray:
+        return np.asarray(self.matrix @ x)
+
+    def __matmul__(self, x: np.ndarray) -> np.ndarray:
+        return self.dot(x)
+
+    def error_bound(self, deltaQ: np.ndarray) -> np.ndarray:
+        """Upper bound on the absolute error in the total stress energy of each deformation due to the cutoff.
 
-        def getUpperPosition(i, j, dimension):
-            firstnum = dimension
-            if i == 0:
-                return j
-            lastnum = firstnum - i + 1
-            countnum = i
-            abovenums = (firstnum + lastnum)*countnum / 2
-            position = abovenums + j - i
-            return int(position)
-        L = []
-        for i in range(dimension):
-            for j in range(i+1):
-                L.append(uppermat[getUpperPosition(j, i, dimension)])
-        return LTMatrix(L)
+        |0.5 * dq . E . dq| <= 0.5 * ||E||_2 * ||dq||^2 <= 0.5 * ||E||_F * ||dq||^2, where E holds the dropped couplings.
+
+        Args:
+            deltaQ (np.ndarray): changes in RICs [DOF index, deformation index]
+
+        Returns:
+            np.ndarray: error bound [1, deformation index]
+        """
+        return 0.5 * self.dropped_norm * np.einsum('ij,ij->j', deltaQ, deltaQ)[np.newaxis, :]
+
+
+def dof_array(dim_indices) -> np.ndarray:
+    """Converts DOFs into the fixed width representation used by Geometry.
+
+    Args:
+        dim_indices: DOFs as tuples of the indices of the atoms involved in them, or already as a (D, 4) array
+
+    Returns:
+        np.ndarray: (D, 4) int32 array of the atom indices of each DOF, zero-padded as in .fchk files
+    """
+    if isinstance(dim_indices, np.ndarray) and dim_indices.ndim == 2:
+        return dim_indices.astype(np.int32, copy=False)
+    dofs = np.zeros((len(dim_indices), 4), dtype=np.int32)
+    for row, dof in enumerate(dim_indices):
+        dofs[row, :len(dof)] = dof
+    return dofs
+
+
+class DOFIndex:
+    """Maps each DOF, given by the indices of the atoms involved in it, to its row in the RICs and Hessian.
+
+    Each DOF is packed into one 64 bit key (16 bits per atom index) and looked up by binary search in the sorted keys.
+    """
+    __slots__ = ('_keys', '_rows')
+
+    def __init__(self, dim_indices) -> None:
+        """Initializes a DOFIndex
+
+        Args:
+            dim_indices: DOFs in order of their rows, as tuples or as a (D, 4) array
+        """
+        keys = DOFIndex.keys(dim_indices)
+        self._rows = np.argsort(keys, kind='stable')
+        self._keys = keys[self._rows]
+
+    @staticmethod
+    def keys(dofs) -> np.ndarray:
+        """Packs DOFs, as tuples or as a (D, 4) array, into one np.uint64 key each."""
+        dofs = dof_array(dofs)
+        # larger indices would silently collide with other DOFs once truncated to 16 bits
+        assert dofs.size == 0 or (dofs.min() >= 0 and dofs.max() < 2**16), \
+            "Atom indices of DOFs must be between 0 and 65535 to be indexed."
+        dofs = dofs.astype(np.uint64)
+        return (dofs[:, 0] << np.uint64(48)) | (dofs[:, 1] << np.uint64(32)) | (dofs[:, 2] << np.uint64(16)) | dofs[:, 3]
+
+    def rows(self, dofs) -> np.ndarray:
+        """Looks up the rows of several DOFs at once.
+
+        Args:
+            dofs: DOFs to look up, as tuples or as a (D, 4) array
+
+        Returns:
+            np.ndarray: row of each DOF, -1 for DOFs which are not indexed
+        """
+        keys = DOFIndex.keys(dofs)
+        if len(self._keys) == 0:
+            return np.full(len(keys), -1, dtype=int)
+        positions = np.minimum(np.searchsorted(self._keys, keys), len(self._keys) - 1)
+        return np.where(self._keys[positions] == keys, self._rows[positions], -1)
+
+    def __getitem__(self, dof: Tuple) -> int:
+        row = self.rows([dof])[0]
+        if row < 0:
+            raise KeyError(dof)
+        return int(row)
+
+    def __contains__(self, dof: Tuple) -> bool:
+        return self.rows([dof])[0] >= 0
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __eq__(self, __o: object) -> bool:
+        return np.array_equal(self._keys, __o._keys) and np.array_equal(self._rows, __o._rows)
 
 
 class Geometry:
-    """Houses data associated with a molecular structure, all public variables are intended for access not modification."""
+    """Houses data associated with a molecular structure, all public variables are intended for access not modification.
+
+    Geometries are kept compact so that thousands of deformed structures cost a few arrays each: DOFs are stored as a (D, 4)
+    array, and the list of DOF tuples and the <ase.Atoms> object are only built when they are first accessed.
+    """
+    __slots__ = ('name', '_path', 'dtype', 'ric', 'energy', '_atoms', '_positions', '_atomic_numbers', 'n_atoms', 'dims',
+                 '_dof_array', '_dim_indices', '_dof_index', '_hessian', '_hessian_loader', '_hessian_rows', '_compact')
 
-    def __init__(self, name: str, path: pathlib.Path, n_atoms: int) -> None:
+    def __init__(self, name: str, path: pathlib.Path, n_atoms: int, dtype=np.float64) -> None:
         self.name = name
         """Name of geometry, based off of stem of .fchk file path unless otherwise modified."""
         self._path = path
         """Path of geometry .fchk file."""
-        self.ric = array('f')
+        self.dtype = np.dtype(dtype)
+        """Floating point precision of the RICs and Hessian"""
+        self.ric = np.zeros(0, dtype=self.dtype)
         """Redundant Internal Coordinates of geometry in atomic units (Bohr radius)"""
         self.energy = None
         """Energy associated with geometry based on the DFT or higher level calculations used to generate the .fchk file input"""
-        self.atoms = list()
-        """<ase.Atoms> object associated with geometry."""
+        self._atoms = None
+        self._positions = None
+        self._atomic_numbers = None
         self.n_atoms = n_atoms
         """Number of atoms"""
         self.dims = array('i')
@@ -154,18 +604,117 @@ class Geometry:
         [3]: dihedral angles
         """
         self.dim_indices = list()
-        """List of Tuples referring to the indices of the atoms involved in each dimension/DOF in order of DOF index in ric"""
 
-        self.hessian = None
+        self._hessian = None
+        self._hessian_loader = None
+        """Callable returning the Hessian of the .fchk file on first access to hessian, None if it is not loaded lazily"""
+        self._hessian_rows = None
+        """Rows (and columns) of the lazily loaded Hessian which correspond to the current DOFs, None for all of them"""
+        self._compact = False
+        """Whether the RICs, DOFs, coordinates and Hessian were dropped by compact()"""
+
+    @property
+    def hessian(self):
         """Hessian matrix associated with the geometry. If 'None', then the associated fchk file did not contain any Hessian,
-        in the case of Gaussian the Hessian is generated when a freq analysis is performed."""
+        in the case of Gaussian the Hessian is generated when a freq analysis is performed.
+
+        If the Hessian was not read during extraction, it is read from the .fchk file on first access and reduced to the
+        current DOFs."""
+        if self._hessian_loader is not None:
+            hessian = self._hessian_loader()
+            self._hessian_loader = None
+            if hessian is not None and self._hessian_rows is not None:
+                hessian = hessian.take(self._hessian_rows) if isinstance(
+                    hessian, PackedHessian) else hessian[np.ix_(self._hessian_rows, self._hessian_rows)]
+            self._hessian_rows = None
+            self._hessian = hessian
+        return self._hessian
+
+    @hessian.setter
+    def hessian(self, hessian):
+        self._hessian = hessian
+        self._hessian_loader = None
+        self._hessian_rows = None
+
+    def load_hessian_lazily(self, loader):
+        """Defers reading the Hessian until it is first accessed.
+
+        Args:
+            loader (callable): returns the Hessian of all the DOFs in the .fchk file, e.g.
+            functools.partial(Extractor.read_hessian, path, dtype, packedHessian)
+        """
+        self._hessian = None
+        self._hessian_loader = loader
+        self._hessian_rows = None
+
+    def compact(self):
+        """Drops the RICs, DOFs, coordinates and Hessian of the geometry once they are no longer needed.
+
+        The name, energy, number of atoms and dims are kept. The <ase.Atoms> of a compacted geometry are read from its .fchk
+        file on every access rather than kept, so that the geometry stays compact.
+        """
+        self.ric = np.zeros(0, dtype=self.dtype)
+        self._dof_array = np.zeros((0, 4), dtype=np.int32)
+        self._dim_indices = None
+        self._dof_index = None
+        self._atoms = None
+        self._positions = None
+        self._atomic_numbers = None
+        self.hessian = None
+        self._compact = True
+
+    @property
+    def atoms(self) -> Atoms:
+        """<ase.Atoms> object associated with geometry, an empty list if no coordinates were given."""
+        if self._compact:
+            return Extractor.read_atoms(self._path)
+        if self._atoms is None:
+            self._atoms = list() if self._positions is None else Atoms(
+                numbers=self._atomic_numbers, positions=self._positions)
+        return self._atoms
+
+    @atoms.setter
+    def atoms(self, atoms: Atoms):
+        self._compact = False
+        self._atoms = atoms
+        self._positions = None
+        self._atomic_numbers = None
+
+    @property
+    def dim_indices(self) -> list[Tuple]:
+        """List of Tuples referring to the indices of the atoms involved in each dimension/DOF in order of DOF index in ric"""
+        if self._dim_indices is None:
+            self._dim_indices = [tuple(int(atom) for atom in dof if atom != 0) for dof in self._dof_array]
+        return self._dim_indices
+
+    @dim_indices.setter
+    def dim_indices(self, dim_indices):
+        self._dof_array = dof_array(dim_indices)
+        self._dim_indices = None
+        self._dof_index = None
+
+    @property
+    def dim_indices_array(self) -> np.ndarray:
+        """(D, 4) int32 array of the indices of the atoms involved in each DOF, zero-padded, in order of DOF index in ric"""
+        return self._dof_array
+
+    @property
+    def offsets(self) -> np.ndarray:
+        """Row at which the bond lengths, bond angles and dihedral angles start in ric, followed by the number of DOFs"""
+        return np.cumsum([0, self.dims[1], self.dims[2], self.dims[3]])
+
+    @property
+    def dof_index(self) -> DOFIndex:
+        """Row of each DOF in ric and hessian, built on first use after dim_indices is set"""
+        if self._dof_index is None:
+            self._dof_index = DOFIndex(self._dof_array)
+        return self._dof_index
 
     def build_atoms(self, raw_coords:list, atomic_num:list):
         assert len(raw_coords) == len(atomic_num) * 3, str(len(raw_coords))+" cartesian coordinates given, incorrect for "+str(len(atomic_num))+" atoms."
-        atomic_coord = [Bohr * float(raw_coord) for raw_coord in raw_coords]
-        atomic_coord = np.reshape(atomic_coord, (self.n_atoms, 3))
-        molecule = ''.join([chemical_symbols[int(i)] for i in atomic_num])
-        self.atoms = Atoms(molecule, atomic_coord)
+        self.atoms = None
+        self._positions = Bohr * np.asarray(raw_coords, dtype=float).reshape((self.n_atoms, 3))
+        self._atomic_numbers = np.asarray(atomic_num, dtype=int)
 
     def build_RIC(self, dims: list, dim_indices_lines: list, coord_lines: list):
         """
@@ -187,87 +736,92 @@ class Geometry:
         # Parses through the 'dimILines' input which indicates which atoms (by index)
         # are involved in each RIC degree of freedom
 
-        raw_indices = list()
-        for indices_line in dim_indices_lines:
-            indices_line_split = indices_line.split()
-            try:
-                raw_indices.extend([int(i) for i in indices_line_split])
-            except ValueError as ve:
-                print(ve)
-                raise Exception("Invalid atom index given as input.")
+        try:
+            raw_indices = np.array(' '.join(dim_indices_lines).split(), dtype=np.int32)
+        except ValueError as ve:
+            logger.error(ve)
+            raise Exception("Invalid atom index given as input.")
 
         # Check that # indices is divisible by 4
         assert len(raw_indices) % 4 == 0 and len(
             raw_indices) == self.dims[0] * 4, "One or more redundant internal coordinate indices are missing or do not have the expected format. Please refer to documentation"
 
-        # Parse into sets of 4, then into tuples of the relevant number of values
-        lengths_count = 0
-        angles_count = 0
-        diheds_count = 0
-        for i in range(0, len(raw_indices), 4):
-            a1 = raw_indices[i]
-            a2 = raw_indices[i+1]
-            a3 = raw_indices[i+2]
-            a4 = raw_indices[i+3]
-            # Check that the number of values in each tuple matches the dimension type (length, angle, dihedral) for that dim index
-            # These should line up with self.dims correctly
-            assert all([(x <= self.n_atoms and x >= 0)
-                       for x in raw_indices[i:i+4]]), "Invalid atom index given as input."
-            assert a1 != a2 and a1 != a3 and a1 != a4 and a2 != a3 and a2 != a4 and (
-                a3 != a4 or a3 == 0), "Invalid RIC dimension given, atomic indices cannot repeat within a degree of freedom."
-            assert a1 != 0 and a2 != 0, "Mismatch between given 'RIC dimensions' and given RIC indices."
-            # bond lengths check
-            if i < self.dims[1]*4:
-                assert a3 == 0 and a4 == 0, "Mismatch between given 'RIC dimensions' and given RIC indices."
-                self.dim_indices.append((a1, a2))
-                lengths_count += 1
-            # bond angles check
-            elif i < (self.dims[1] + self.dims[2])*4:
-                assert a3 != 0 and a4 == 0, "Mismatch between given 'RIC dimensions' and given RIC indices."
-                self.dim_indices.append((a1, a2, a3))
-                angles_count += 1
-            # dihedral angles check
-            elif i < (self.dims[1] + self.dims[2] + self.dims[3])*4:
-                assert a3 != 0 and a4 != 0, "Mismatch between given 'RIC dimensions' and given RIC indices."
-                self.dim_indices.append((a1, a2, a3, a4))
-                diheds_count += 1
-
-        assert lengths_count == self.dims[1] and angles_count == self.dims[2] and diheds_count == self.dims[
-            3], "Redundant internal coordinate indices given inconsistent with Redundant internal dimensions given."
+        # Sets of 4, zero-padded according to the dimension type (length, angle, dihedral) of each dim index, which
+        # should line up with self.dims correctly
+        indices = raw_indices.reshape((-1, 4))
+        a1, a2, a3, a4 = indices.T
+        kind = np.repeat([1, 2, 3], self.dims[1:4])
+        mismatch = "Mismatch between given 'RIC dimensions' and given RIC indices."
+        checks = [(np.all((indices <= self.n_atoms) & (indices >= 0), axis=1), "Invalid atom index given as input."),
+                  ((a1 != a2) & (a1 != a3) & (a1 != a4) & (a2 != a3) & (a2 != a4) & ((a3 != a4) | (a3 == 0)),
+                   "Invalid RIC dimension given, atomic indices cannot repeat within a degree of freedom."),
+                  ((a1 != 0) & (a2 != 0), mismatch),
+                  # bond lengths, bond angles and dihedral angles checks
+                  ((a3 != 0) == (kind > 1), mismatch),
+                  ((a4 != 0) == (kind > 2), mismatch)]
+        failed = ~np.stack([passed for passed, _ in checks], axis=1)
+        invalid = np.flatnonzero(failed.any(axis=1))
+        # reports the first check failed by the first invalid DOF
+        assert len(invalid) == 0, checks[int(np.argmax(failed[invalid[0]]))][1]
+        self.dim_indices = indices
 
         # endregion
 
         try:
-            for line in coord_lines:
-                self.ric.extend([float(ric) for ric in line.split()])
+            self.ric = np.array(' '.join(coord_lines).split(), dtype=self.dtype)
         except ValueError:
             raise(Exception(
                 "Redundant internal coordinates contains invalid values, such as strings."))
 
-        self.ric = np.asarray(self.ric, dtype=np.float32)
         assert len(self.ric) == self.dims[0], "Mismatch between the number of degrees of freedom expected ("+str(
             dims[0])+") and number of coordinates given ("+str(len(self.ric))+")."
 
-        # Angles are moved (-pi, pi)
-        for i in range(self.dims[1], self.dims[0]):
-            self.ric[i] = self.ric[i]
-
     def _kill_DOFs(self, dof_indices: list[int]):
         """Takes in list of indices of degrees of freedom to remove, Removes DOFs from ric, dim_indices, and hessian, updates dims"""
-        self.ric = np.delete(self.ric, dof_indices)
-        self.dim_indices = np.delete(self.dim_indices, dof_indices)
-        lengths_deleted = sum(x < self.dims[1] and x >= 0 for x in dof_indices)
-        angles_deleted = sum(
-            x < self.dims[2] + self.dims[1] and x >= self.dims[1] for x in dof_indices)
-        dihedrals_deleted = sum(
-            x < self.dims[0] and x >= self.dims[2] + self.dims[1] for x in dof_indices)
-        self.dims[0] -= len(dof_indices)
-        self.dims[1] -= lengths_deleted
-        self.dims[2] -= angles_deleted
-        self.dims[3] -= dihedrals_deleted
-        if(self.hessian is not None):
-            self.hessian = np.delete(self.hessian, dof_indices, axis=0)
-            self.hessian = np.delete(self.hessian, dof_indices, axis=1)
+        keep = np.ones(self.dims[0], dtype=bool)
+        keep[np.asarray(dof_indices, dtype=int)] = False
+        self._keep_DOFs(keep)
+
+    def _keep_DOFs(self, keep: np.ndarray):
+        """Takes in a boolean mask over the degrees of freedom, Keeps only the masked DOFs in ric, dim_indices, and hessian,
+        updates dims. The Hessian is sliced once rather than deleted along each axis in turn."""
+        kept = np.flatnonzero(keep)
+        self.ric = self.ric[kept]
+        self._select_dim_indices(kept)
+        if self._select_lazy_hessian(kept):
+            return
+        if isinstance(self.hessian, PackedHessian):
+            self.hessian = self.hessian.delete(np.flatnonzero(~keep))
+        elif isinstance(self.hessian, np.memmap):
+            self.hessian = delete_mapped(self.hessian, np.flatnonzero(~keep))
+        elif(self.hessian is not None):
+            self.hessian = np.asarray(self.hessian)[np.ix_(kept, kept)]
+
+    def _select_dim_indices(self, rows: np.ndarray):
+        """Keeps the DOFs in rows, in their order, in dim_indices and updates dims to match"""
+        self.dim_indices = self._dof_array[rows]
+        lengths = np.bincount(np.count_nonzero(self._dof_array, axis=1), minlength=5)
+        self.dims = array('i', [len(rows), lengths[2], lengths[3], lengths[4]])
+
+    def _select_lazy_hessian(self, rows: np.ndarray) -> bool:
+        """Records a selection of DOFs to apply to the Hessian once it is loaded, returns False if it is not loaded lazily"""
+        if self._hessian_loader is None:
+            return False
+        self._hessian_rows = rows if self._hessian_rows is None else self._hessian_rows[rows]
+        return True
+
+    def _reorder_DOFs(self, rows: list[int]):
+        """Takes in the indices of the degrees of freedom to keep in their new order, Gathers ric, dim_indices, and hessian
+        accordingly, updates dims. DOFs not in rows are removed."""
+        rows = np.asarray(rows, dtype=int)
+        self.ric = self.ric[rows]
+        self._select_dim_indices(rows)
+        if self._select_lazy_hessian(rows):
+            return
+        if isinstance(self.hessian, PackedHessian):
+            self.hessian = self.hessian.take(rows)
+        elif self.hessian is not None:
+            self.hessian = np.asarray(self.hessian)[np.ix_(rows, rows)]
 
     def __eq__(self, __o: object) -> bool:
         b = True
@@ -277,7 +831,7 @@ class Geometry:
         b = b and self.atoms == __o.atoms
         b = b and self.n_atoms == __o.n_atoms
         b = b and np.array_equal(self.dims, __o.dims)
-        b = b and np.array_equal(self.dim_indices, __o.dim_indices)
+        b = b and np.array_equal(self.dim_indices_array, __o.dim_indices_array)
         b = b and ((self.hessian is None and __o.hessian is None)
                    or np.array_equal(self.hessian, __o.hessian))
         return b
@@ -308,6 +862,101 @@ class UnitConverter:
         return np.float32(r / np.pi * 180)
 
 
+class FchkIndex:
+    """Index of the sections of a .fchk file, from which single sections are read on demand by seeking to them.
+
+    Section headers are of the form '<name, 40 characters>   <type>   N=<count>' for arrays and
+    '<name, 40 characters>   <type>     <value>' for scalars, with type I (integer), R (real), C or H (text) or L (logical).
+    """
+
+    values_per_line = {'I': 6, 'R': 5, 'C': 5, 'H': 9, 'L': 72}
+    """Number of values on each line of an array section, by type"""
+
+    def __init__(self, path: Path, sections: dict = None) -> None:
+        """Initializes a FchkIndex, indexing the file in a single pass unless the sections are given.
+
+        Args:
+            path (Path): .fchk file
+            sections (dict, optional): previously built FchkIndex.sections of the file. Defaults to None.
+        """
+        self.path = Path(path)
+        """Indexed .fchk file"""
+        self.sections = FchkIndex._index(self.path) if sections is None else sections
+        """Sections by name: [byte offset of the first data line, type, count] for arrays, [None, type, value] for scalars"""
+
+    @staticmethod
+    def _index(path: Path) -> dict:
+        sections = dict()
+        offset = 0
+        with path.open('rb') as file:
+            for line in file:
+                offset += len(line)
+                if len(line) < 45 or line[:1].isspace() or line[40:43] != b'   ' or chr(line[43]) not in FchkIndex.values_per_line:
+                    continue
+                header = line.decode()
+                name = header[:40].strip()
+                if header[47:49] == 'N=':
+                    sections[name] = [offset, header[43], int(header[49:])]
+                else:
+                    value = header[44:].strip()
+                    sections[name] = [None, header[43], int(value) if header[43] == 'I' else (
+                        float(value) if header[43] == 'R' else value)]
+        return sections
+
+    @staticmethod
+    def open(path: Path, indexPath: Path = None) -> 'FchkIndex':
+        """Opens the index of a .fchk file, building it only if there is no stored index matching the file.
+
+        Args:
+            path (Path): .fchk file
+            indexPath (Path, optional): .json file in which the index is stored. Defaults to None, which always builds it.
+
+        Returns:
+            FchkIndex: index of the file
+        """
+        path = Path(path)
+        stat = path.stat()
+        key = {'size': stat.st_size, 'mtime': stat.st_mtime_ns}
+        if indexPath is not None and Path(indexPath).exists():
+            with Path(indexPath).open() as file:
+                stored = json.load(file)
+            if stored['key'] == key:
+                return FchkIndex(path, stored['sections'])
+        index = FchkIndex(path)
+        if indexPath is not None:
+            def writer(temporary):
+                with temporary.open('w') as file:
+                    json.dump({'key': key, 'sections': index.sections}, file)
+
+            _atomic_write(indexPath, writer)
+        return index
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.sections
+
+    def read(self, name: str, dtype=np.float64):
+        """Reads a single section of the file.
+
+        Args:
+            name (str): name of the section, as in its header
+            dtype (numpy.dtype, optional): floating point precision of real sections. Defaults to numpy.float64.
+
+        Returns:
+            the value of a scalar section, or the values of an array section as a np.ndarray (a str for text sections)
+        """
+        offset, kind, count = self.sections[name]
+        if offset is None:
+            return count
+        with self.path.open('rb') as file:
+            file.seek(offset)
+            block = b''.join(file.readline() for _ in range(math.ceil(count / FchkIndex.values_per_line[kind]))).decode()
+        if kind in 'CH':
+            return ''.join(line.rstrip('\n') for line in block.splitlines(True))
+        if kind == 'L':
+            return np.array([value == 'T' for value in ''.join(block.split())])
+        return np.array(block.split(), dtype=int if kind == 'I' else dtype)
+
+
 class Extractor:
     """Used on a per .fchk file basis to organize lines from the fchk file into a Geometry
 
@@ -315,12 +964,18 @@ class Extractor:
         The user really shouldn't be using this class 0.0 unless they perhaps want a custom one for
         non-fchk files, in which case they should make a new class inheriting from and overriding methods in this one."""
 
-    def __init__(self, path: Path, lines_list: list) -> None:
+    def __init__(self, path: Path, lines_list: list, dtype=np.float64, packedHessian=False, readHessian=True) -> None:
         """Initializes an Extractor
 
         Args:
             path (Path): path to the fchk file to extract into a SITH.Utilities.Geometry object
-            lines_list (list): content of the input fchk file as a list of the lines of the file.
+            lines_list (list): content of the input fchk file as a list of the lines of the file, any other iterator of
+            lines such as an open file object, or the whole content as a single string buffer.
+            dtype (numpy.dtype, optional): floating point precision of the extracted RICs and Hessian. Defaults to numpy.float64.
+            packedHessian (bool, optional): keep the Hessian as a PackedHessian instead of expanding it into a full
+            matrix. Defaults to False.
+            readHessian (bool, optional): parse the Internal Force Constants, if False they are skipped and the Geometry's
+            hessian is left as None. Defaults to True.
         """        
         self.__energy_header = "Total Energy"
         self.__hessian_header = "Internal Force Constants"
@@ -333,114 +988,185 @@ class Extractor:
 
         self._path = path
         self._name = path.stem
+        self._dtype = np.dtype(dtype)
+        self._packedHessian = packedHessian
+        self._readHessian = readHessian
 
         self.geometry = None
         "Geometry object into which the Extractor loads the extracted fchk data"
 
+        if isinstance(lines_list, str):
+            lines_list = io.StringIO(lines_list)
         self.__lines = lines_list
 
     def _extract(self) -> bool:
         """Extracts and populates Geometry information from self.__lines
 
+        The lines are consumed in a single forward pass, so self.__lines may be any iterator of lines such as an open file,
+        and only the block of the section currently being parsed is held in memory.
+
         Returns:
             bool: True if successful
         """        
 
         try:
-            i = 0
             atomic_nums = list()
-            while i < len(self.__lines):
-                line = self.__lines[i]
-
+            lines = iter(self.__lines)
+            for line in lines:
                 # This all must be in order because of the way things show up in the fchk file, it makes no sense to build
                 # these out separately to reduce dependencies because it will just increase the number of times to traverse the data.
                 if self.__num_atoms_header in line:
                     split_line = line.split()
                     num_atoms = int(split_line[len(split_line)-1])
-                    self.geometry = Geometry(self._name, self._path, num_atoms)
+                    self.geometry = Geometry(
+                        self._name, self._path, num_atoms, self._dtype)
 
-                if self.__atomic_nums_header in line:
-                    i += 1
-                    stop = int(line.split()[-1])
-                    count = 0
-                    while count < stop:
-                        atomic_nums.extend(self.__lines[i].split())
-                        count += len(self.__lines[i].split())
-                        i += 1
+                elif self.__atomic_nums_header in line:
+                    atomic_nums = Extractor._read_array(lines, line, int)
 
                 elif self.__energy_header in line:
                     split_line = line.split()
                     self.geometry.energy = float(split_line[len(split_line)-1])
 
                 elif self.__RIC_dim_header in line:
-                    i = i+1
-                    lin = self.__lines[i]
-                    r_dims = lin.split()
+                    r_dims = next(lines).split()
 
                 elif self.__RIC_indices_header in line:
-                    rdiStart = i+1
-                    stop = int(line.split()[-1])
-                    count = 0
-                    while count < stop:
-                        count += len(self.__lines[i].split())
-                        i += 1
-                    xrDims = self.__lines[rdiStart:i+1]
+                    xrDims = Extractor._read_lines(
+                        lines, int(line.split()[-1]), Extractor._values_per_line(line))
                     assert len(
                         xrDims) > 0, "Missing Redundant internal coordinate indices."
 
-                if self.__RIC_header in line:
-                    i = i+1
-                    xrStart = i
-                    stop = int(line.split()[-1])
-                    count = 0
-                    while count < stop:
-                        count += len(self.__lines[i].split())
-                        i += 1
-                    xrRaw = self.__lines[xrStart:i]
+                elif self.__RIC_header in line:
+                    xrRaw = Extractor._read_lines(lines, int(line.split()[-1]), Extractor._values_per_line(line))
                     self.geometry.build_RIC(r_dims, xrDims, xrRaw)
 
-                if self.__cartesian_coords_header in line:
-                    i = i+1
-                    stop = int(line.split()[-1])
-                    count = 0
-                    c_raw = list()
-                    while count < stop:
-                        c_raw.extend(self.__lines[i].split())
-                        count += len(self.__lines[i].split())
-                        i += 1
+                elif self.__cartesian_coords_header in line:
+                    c_raw = Extractor._read_array(lines, line, self._dtype)
                     assert len(atomic_nums) == num_atoms, "Mismatch between length of atomic numbers and number of atoms specified."
                     self.geometry.build_atoms(c_raw, atomic_nums)
 
                 elif self.__hessian_header in line:
-                    i = i+1
-                    stop = int(line.split()[-1])
-                    self.h_raw = list()
-                    while len(self.h_raw) < stop:
-                        row = self.__lines[i]
-                        row_split = row.split()
-                        self.h_raw.extend([float(i) for i in row_split])
-                        i = i+1
-
-                
-                    
-                i = i + 1
-            print("Building full Hessian matrix.")
-            self.build_hessian()
-
-
-            print("Cartesian data extracted successfully.")
+                    if self._readHessian:
+                        self.h_raw = Extractor._read_array(lines, line, self._dtype)
+                    else:
+                        Extractor._read_lines(lines, int(line.split()[-1]), Extractor._values_per_line(line))
+
+            if self._readHessian:
+                logger.debug("Building full Hessian matrix.")
+                self.build_hessian()
+
+
+            logger.debug("Cartesian data extracted successfully.")
             return True
-        except Exception as e:
-            print(e)
-            print("Data extraction failed.")
+        except Exception:
+            logger.exception("Data extraction failed.")
             return False
 
+    @staticmethod
+    def _values_per_line(header: str) -> int:
+        """Number of values per line of the section starting with header, None if its type is not known."""
+        return FchkIndex.values_per_line.get(header[43]) if len(header) > 43 else None
+
+    @staticmethod
+    def _read_lines(lines, count: int, per_line: int = None) -> list[str]:
+        """Reads the lines of an fchk section holding count values from an iterator of lines.
+
+        Args:
+            lines (Iterator[str]): lines positioned right after the section header
+            count (int): number of values in the section, as given by 'N=' in its header
+            per_line (int, optional): number of values per full line, as given by the section type. Defaults to None,
+            which counts the values of each line instead.
+
+        Returns:
+            list[str]: lines of the section
+        """
+        if per_line is not None:
+            return list(islice(lines, math.ceil(count / per_line)))
+        block = list()
+        read = 0
+        while read < count:
+            line = next(lines)
+            block.append(line)
+            read += len(line.split())
+        return block
+
+    @staticmethod
+    def _read_array(lines, header: str, dtype) -> np.ndarray:
+        """Reads a numeric fchk section in bulk, converting the text of the whole block with a single numpy call.
+
+        Args:
+            lines (Iterator[str]): lines positioned right after the section header
+            header (str): section header line, giving the type and number of values
+            dtype (numpy.dtype): type of the values
+
+        Returns:
+            np.ndarray: values of the section
+        """
+        count = int(header.split()[-1])
+        values = np.array(' '.join(Extractor._read_lines(
+            lines, count, Extractor._values_per_line(header))).split(), dtype=dtype)
+        assert len(values) == count, "Expected " + str(count) + " values in section '" + header[:40].strip() + \
+            "' but found " + str(len(values)) + "."
+        return values
+
     def build_hessian(self):
         """Properly formats the Hessian matrix from the lower triangular matrix given by the .fchk data"""
-        lt_mat = LTMatrix(self.h_raw)
-        self.hessian = lt_mat.full_mat
+        self.hessian = self._format_hessian()
         self.geometry.hessian = self.hessian
 
+    def _format_hessian(self):
+        packed = PackedHessian(self.h_raw, self._dtype)
+        return packed if self._packedHessian else packed.full_mat
+
+    @staticmethod
+    def read_atoms(path: Path) -> Atoms:
+        """Reads only the atoms of a .fchk file.
+
+        Args:
+            path (Path): .fchk file
+
+        Returns:
+            Atoms: atoms at the current cartesian coordinates, as they would be extracted into Geometry.atoms
+        """
+        index = FchkIndex(path)
+        extractor = Extractor(Path(path), [])
+        positions = index.read(extractor.__cartesian_coords_header, float)
+        return Atoms(numbers=index.read(extractor.__atomic_nums_header), positions=Bohr * positions.reshape((-1, 3)))
+
+    @staticmethod
+    def read_hessian(path: Path, dtype=np.float64, packedHessian=False, indexPath=None):
+        """Reads only the Hessian of a .fchk file.
+
+        Args:
+            path (Path): .fchk file
+            dtype (numpy.dtype, optional): floating point precision of the Hessian. Defaults to numpy.float64.
+            packedHessian (bool, optional): return a PackedHessian instead of a full matrix. Defaults to False.
+            indexPath (Path, optional): stored FchkIndex of the file, used to seek directly to the Internal Force
+            Constants (and built if missing or outdated). Defaults to None, which reads the file up to the end of the
+            Internal Force Constants instead.
+
+        Returns:
+            Hessian as it would be extracted into Geometry.hessian, None if the file does not contain one.
+        """
+        extractor = Extractor(Path(path), [], dtype, packedHessian)
+        if indexPath is not None:
+            index = FchkIndex.open(path, indexPath)
+            if extractor.__hessian_header not in index:
+                return None
+            extractor.h_raw = index.read(extractor.__hessian_header, dtype)
+            return extractor._format_hessian()
+        with Path(path).open() as file:
+            return Extractor(Path(path), file, dtype, packedHessian)._read_hessian()
+
+    def _read_hessian(self):
+        lines = iter(self.__lines)
+        for line in lines:
+            if self.__hessian_header in line:
+                self.h_raw = Extractor._read_array(lines, line, self._dtype)
+                return self._format_hessian()
+        return None
+
     def get_geometry(self) -> Geometry:
         """Gets the geometry as extracted from the .fchk file given to the Extractor.
 
@@ -456,24 +1182,321 @@ class Extractor:
             raise Exception("There is no geometry.")
 
 
+class GeometryCache:
+    """On-disk cache of extracted Geometry data, one .npz file per .fchk file.
+
+    Each entry is keyed by the resolved path, size, modification time and SHA-256 of the content of its .fchk file as well
+    as by the precision it was extracted with, and is only used if all of them still match.
+    """
+
+    def __init__(self, directory: Path) -> None:
+        """Initializes a GeometryCache
+
+        Args:
+            directory (Path): directory holding the cache entries, created if it does not exist.
+        """
+        self.directory = Path(directory)
+        """Directory holding the cache entries"""
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def fingerprint(path: Path, dtype) -> dict:
+        """Computes the key of the cache entry of a .fchk file.
+
+        Args:
+            path (Path): .fchk file
+            dtype (numpy.dtype): floating point precision of the extracted data
+
+        Returns:
+            dict: resolved path, size, modification time (ns), SHA-256 hex digest of the content, and dtype name
+        """
+        stat = path.stat()
+        digest = hashlib.sha256()
+        with path.open('rb') as file:
+            for chunk in iter(lambda: file.read(2**20), b''):
+                digest.update(chunk)
+        return {'path': str(path.resolve()), 'size': stat.st_size, 'mtime': stat.st_mtime_ns,
+                'sha256': digest.hexdigest(), 'dtype': np.dtype(dtype).name}
+
+    def _entry(self, path: Path) -> Path:
+        return self.directory / (hashlib.sha1(str(path.resolve()).encode()).hexdigest() + '.npz')
+
+    def index_path(self, path: Path) -> Path:
+        """Path at which the FchkIndex of a .fchk file is stored in the cache."""
+        return self._entry(path).with_suffix('.json')
+
+    def load(self, path: Path, dtype=np.float64, packedHessian=False, fingerprint=None, readHessian=True):
+        """Loads the cached Geometry of a .fchk file.
+
+        Args:
+            path (Path): .fchk file
+            dtype (numpy.dtype, optional): floating point precision of the RICs and Hessian. Defaults to numpy.float64.
+            packedHessian (bool, optional): rebuild the Hessian as a PackedHessian. Defaults to False.
+            fingerprint (dict, optional): precomputed GeometryCache.fingerprint(path, dtype). Defaults to None.
+            readHessian (bool, optional): whether the Hessian is needed, if False the cached Hessian is not loaded and if
+            True entries stored without reading the Hessian are not valid. Defaults to True.
+
+        Returns:
+            Geometry: cached geometry, or None if there is no valid entry for the file in its current state.
+        """
+        entry = self._entry(path)
+        if not entry.exists():
+            return None
+        if fingerprint is None:
+            fingerprint = GeometryCache.fingerprint(path, dtype)
+        with np.load(entry, allow_pickle=False) as data:
+            if any(str(data['key_' + key]) != str(value) for key, value in fingerprint.items()):
+                return None
+            if readHessian and 'hessian_read' in data and not bool(data['hessian_read']):
+                return None
+            geometry = Geometry(str(data['name']), path, int(data['n_atoms']), dtype)
+            energy = float(data['energy'])
+            geometry.energy = None if np.isnan(energy) else energy
+            geometry.dims = array('i', data['dims'].tolist())
+            geometry.dim_indices = data['dim_indices']
+            geometry.ric = data['ric'].astype(dtype)
+            # geometries without cartesian coordinates are stored without atoms, their atoms stay an empty list
+            if 'has_atoms' not in data or bool(data['has_atoms']):
+                geometry._atomic_numbers = data['atomic_numbers']
+                geometry._positions = data['positions']
+            if readHessian and 'hessian' in data:
+                hessian = PackedHessian(data['hessian'], dtype)
+                geometry.hessian = hessian if packedHessian else hessian.full_mat
+        return geometry
+
+    def store(self, path: Path, geometry: Geometry, fingerprint=None, readHessian=True):
+        """Stores the extracted Geometry of a .fchk file.
+
+        Args:
+            path (Path): .fchk file from which geometry was extracted
+            geometry (Geometry): extracted geometry
+            fingerprint (dict, optional): precomputed GeometryCache.fingerprint(path, geometry.dtype). Defaults to None.
+            readHessian (bool, optional): whether the Hessian was read during extraction. Defaults to True.
+        """
+        if fingerprint is None:
+            fingerprint = GeometryCache.fingerprint(path, geometry.dtype)
+        arrays = {'key_' + key: np.array(value) for key, value in fingerprint.items()}
+        arrays.update(hessian_read=np.array(readHessian), name=np.array(geometry.name), n_atoms=np.array(geometry.n_atoms),
+                      energy=np.array(np.nan if geometry.energy is None else geometry.energy),
+                      dims=np.array(geometry.dims), dim_indices=geometry.dim_indices_array, ric=np.asarray(geometry.ric))
+        hasAtoms = isinstance(geometry.atoms, Atoms)
+        arrays.update(has_atoms=np.array(hasAtoms),
+                      atomic_numbers=geometry.atoms.get_atomic_numbers() if hasAtoms else np.zeros(0, dtype=int),
+                      positions=geometry.atoms.get_positions() if hasAtoms else np.zeros((0, 3)))
+        if not readHessian:
+            pass
+        elif isinstance(geometry.hessian, PackedHessian):
+            arrays['hessian'] = geometry.hessian.packed
+        elif geometry.hessian is not None:
+            arrays['hessian'] = np.asarray(geometry.hessian)[np.tril_indices(len(geometry.hessian))]
+        def writer(temporary):
+            with temporary.open('wb') as file:
+                np.savez(file, **arrays)
+
+        _atomic_write(self._entry(path), writer)
+
+
+class PhaseTimer:
+    """Wall time, bytes read or written, and number of items processed by each phase of a run.
+
+    Phases are kept in the order in which they first ran, and the records of a phase which runs several times accumulate.
+    Each record is a dict of 'seconds', 'bytes', 'items' and 'calls'.
+    """
+
+    fields = ('seconds', 'bytes', 'items', 'calls')
+
+    def __init__(self) -> None:
+        self.phases = dict()
+        """dict[str, dict]: record of each phase by name"""
+
+    def record(self, name: str) -> dict:
+        """Record of a phase, created empty if the phase has not run yet."""
+        if name not in self.phases:
+            self.phases[name] = {'seconds': 0., 'bytes': 0, 'items': 0, 'calls': 0}
+        return self.phases[name]
+
+    @contextmanager
+    def phase(self, name: str, items=0, nbytes=0):
+        """Times the block of a with statement as a run of a phase.
+
+        Args:
+            name (str): phase
+            items (int, optional): number of items processed. Defaults to 0.
+            nbytes (int, optional): number of bytes read or written. Defaults to 0.
+
+        Yields:
+            dict: record of the phase, to which counts only known inside the block can be added
+        """
+        record = self.record(name)
+        record['items'] += items
+        record['bytes'] += nbytes
+        record['calls'] += 1
+        start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record['seconds'] += time.perf_counter() - start
+
+    def add(self, name: str, seconds=0., nbytes=0, items=0, calls=1):
+        """Adds a run of a phase which was measured elsewhere, such as in a worker process."""
+        record = self.record(name)
+        record['seconds'] += seconds
+        record['bytes'] += nbytes
+        record['items'] += items
+        record['calls'] += calls
+
+    def merge(self, other: 'PhaseTimer'):
+        """Adds every phase recorded by another PhaseTimer."""
+        for name, record in other.phases.items():
+            self.add(name, record['seconds'], record['bytes'], record['items'], record['calls'])
+
+    def __getitem__(self, name: str) -> dict:
+        return self.phases[name]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.phases
+
+    def report(self) -> str:
+        """Table of the recorded phases, one per line."""
+        lines = [f"{'Phase':<12}{'Seconds':>12}{'MB':>12}{'Items':>10}{'Calls':>8}"]
+        lines += [f"{name:<12}{record['seconds']:>12.4f}{record['bytes'] / 2**20:>12.3f}{record['items']:>10}"
+                  f"{record['calls']:>8}" for name, record in self.phases.items()]
+        return '\n'.join(lines)
+
+
+class TimedReader(io.RawIOBase):
+    """Raw binary file which records the time spent in its reads and the bytes they returned.
+
+    Wrapped in io.BufferedReader and io.TextIOWrapper it is read line by line like any text file, while the time spent
+    reading from disk is told apart from the time spent parsing the lines.
+    """
+
+    def __init__(self, raw) -> None:
+        """Initializes a TimedReader
+
+        Args:
+            raw (io.RawIOBase): unbuffered binary file, closed with the TimedReader
+        """
+        super().__init__()
+        self.raw = raw
+        self.seconds = 0.
+        """float: wall time spent reading"""
+        self.bytes = 0
+        """int: number of bytes read"""
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        start = time.perf_counter()
+        count = self.raw.readinto(buffer)
+        self.seconds += time.perf_counter() - start
+        self.bytes += count or 0
+        return count
+
+    def close(self):
+        self.raw.close()
+        super().close()
+
+
 class void:
     pass
 
 
+class _SummaryArray:
+    """Attribute of a SummaryReader which is memory-mapped from the .npy file of the same name in a binary summary on first
+    access. Attributes read from a text summary are set on the instance and take precedence."""
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, reader, owner=None):
+        if reader is None:
+            return self
+        values = np.load(reader._directory / (self.name + '.npy'), mmap_mode='r', allow_pickle=False)
+        setattr(reader, self.name, values)
+        return values
+
+
+class _SummaryStructure(void):
+    """Structure of a binary summary, whose <ase.Atoms> are only built on first access."""
+
+    def __init__(self, reader: 'SummaryReader', index: int) -> None:
+        self._reader = reader
+        self._index = index
+        self._atoms = None
+
+    @property
+    def atoms(self) -> Atoms:
+        if self._atoms is None:
+            self._atoms = Atoms(numbers=self._reader.atomic_numbers,
+                                positions=self._reader.positions[self._index])
+        return self._atoms
+
+    @atoms.setter
+    def atoms(self, atoms: Atoms):
+        self._atoms = atoms
+
+
 class SummaryReader:
+    deltaQ = _SummaryArray()
+    energies = _SummaryArray()
+    deformationEnergy = _SummaryArray()
+    accuracy = _SummaryArray()
+    positions = _SummaryArray()
+    atomic_numbers = _SummaryArray()
+    names = _SummaryArray()
+
+    _section_headers = ('Redundant Internal Coordinate Definitions\n',
+                        'Changes in internal coordinates (\u0394q)\n',
+                        '**  Energy Analysis  **\n',
+                        'Overall Structural Energies\n',
+                        'Energy per DOF (RIC)\n',
+                        'XYZ FILES APPENDED\n')
+    _dof_punctuation = str.maketrans('(,)', '   ')
+
     def __init__(self, file:str):
         """Extract the data in a summary file
 
         Args:
-            file (str): summary file from which to extract data
+            file (str): summary file from which to extract data, either the text summary written by
+            SithWriter.write_summary or the binary summary directory written by SithWriter.write_binary_summary. The
+            arrays of a binary summary are memory-mapped on first access rather than read.
         """        
-        with open(file) as data:
-            self.info = data.readlines()
-
         self._reference = void()
         self._deformed = list()
+        self._directory = Path(file)
+        if self._directory.is_dir():
+            self.read_binary()
+            return
+
+        with open(file) as data:
+            self.info = data.readlines()
         self.read_all()
 
+    def read_binary(self):
+        """
+        Opens a binary summary, only the DOFs are read immediately
+        """
+        dim_indices = np.load(self._directory / 'dim_indices.npy', allow_pickle=False)
+        self.dim_indices = [tuple(int(atom) for atom in dof if atom != 0) for dof in dim_indices]
+        self._reference = _SummaryStructure(self, 0)
+        self._reference.dims = np.load(self._directory / 'dims.npy', allow_pickle=False)
+        self._reference.dim_indices = self.dim_indices
+        self._reference.dof_index = DOFIndex(dim_indices)
+        nDeformed = np.load(self._directory / 'deformationEnergy.npy', mmap_mode='r').shape[1]
+        self._deformed = [_SummaryStructure(self, i + 1) for i in range(nDeformed)]
+
+    def _locate_sections(self):
+        """
+        Records the line number of every section header of the summary in a single pass over the file
+        """
+        headers = set(self._section_headers)
+        self._sections = dict()
+        for i, line in enumerate(self.info):
+            if line in headers and line not in self._sections:
+                self._sections[line] = i
+
     def read_section(self, header, tail, iplus=0, jminus=0) -> list[str]:       
         """
         Take any block of a set of lines separated by header
@@ -491,11 +1514,27 @@ class SummaryReader:
         Returns:
             data (list[str]): set of lines extracted
         """
-        i = self.info.index(header)
-        j = self.info.index(tail)
+        if not hasattr(self, '_sections'):
+            self._locate_sections()
+        i = self._sections[header] if header in self._sections else self.info.index(header)
+        j = self._sections[tail] if tail in self._sections else self.info.index(tail)
         data = self.info[i+iplus:j-jminus]
         return data
 
+    @staticmethod
+    def _read_table(lines) -> np.ndarray:
+        """
+        Converts a block of table rows into one array, dropping the label in the first column
+
+        Args:
+            lines (list[str]): rows of the table, all with the same number of columns.
+
+        Returns:
+            (np.ndarray): (rows, columns - 1) array of floats.
+        """
+        table = np.array(' '.join(lines).split()).reshape(len(lines), -1)
+        return table[:, 1:].astype(float)
+
     def read_dofs(self) -> list[tuple]:
         """Read in the degrees of freedom in the summary file
 
@@ -508,11 +1547,7 @@ class SummaryReader:
                                   'Changes in internal coordinates' +
                                   ' (\u0394q)\n',
                                   iplus=2)
-        return [tuple(np.fromstring(line.replace('(',
-                                                 '').replace(',',
-                                                             '').replace(')',
-                                                                         ''),
-                sep=' ', dtype=int)[1:])
+        return [tuple(map(int, line.translate(self._dof_punctuation).split()[1:]))
                 for line in lines]
 
 #TODO make this a 2D array with row column maybe? for ease bc lists take up more than arrays
@@ -528,7 +1563,7 @@ class SummaryReader:
                                   ' (\u0394q)\n',
                                   '**  Energy Analysis  **\n',
                                   iplus=3, jminus=2)
-        return np.array([np.fromstring(line, sep=' ')[1:] for line in lines])
+        return self._read_table(lines)
 
 #TODO finish making documentation conform with Google style
     def read_accuracy(self) -> np.ndarray:     
@@ -543,9 +1578,7 @@ class SummaryReader:
                                   'Energy per DOF (RIC)\n',
                                   iplus=2)
 
-        return np.array([np.array(line.split()[1:],
-                                  dtype=float)
-                         for line in lines]).T
+        return self._read_table(lines).T
 
     def read_energies(self, ndofs):
         """
@@ -558,28 +1591,27 @@ class SummaryReader:
                                   'Energy per DOF (RIC)\n',
                                   iplus=2, jminus=-ndofs-2)
 
-        return np.array([np.array(line.split(),
-                                  dtype=float)[1:]
-                         for line in lines])
+        return self._read_table(lines)
 
     def read_structures(self):
         """
         Creates the ase.Atoms objects of each structure.
         """
-        init = self.info.index("XYZ FILES APPENDED\n") + 1
-        n_configs = len(self.deltaQ[0]) + 1  # deformed plus reference
+        if not hasattr(self, '_sections'):
+            self._locate_sections()
+        init = self._sections["XYZ FILES APPENDED\n"] + 1
+        n_configs = self.deltaQ.shape[1] + 1  # deformed plus reference
         length = int(len(self.info[init:])/n_configs)
         n_atoms = int(self.info[init])
 
-        configs = [self.info[init+i*(length):init+(i+1)*length]
-                   for i in range(n_configs)]
-        configs = [[atom.split() for atom in config] for config in configs]
-        molecule = ''.join([atom[0] for atom in configs[0][-n_atoms:]])
-        positions = np.array([[np.array(atom[1:], dtype=float)
-                              for atom in config[-n_atoms:]]
-                              for config in configs])
+        # only the last n_atoms lines of each xyz block hold atoms
+        atom_lines = [line for i in range(n_configs)
+                      for line in self.info[init+(i+1)*length-n_atoms:init+(i+1)*length]]
+        table = np.array(' '.join(atom_lines).split()).reshape(n_configs, n_atoms, -1)
+        symbols = list(table[0, :, 0])
+        positions = table[:, :, 1:4].astype(float)
 
-        atoms = [Atoms(molecule, config) for config in positions]
+        atoms = [Atoms(symbols, config) for config in positions]
 
         return atoms[0], atoms[1:]
 
@@ -587,6 +1619,7 @@ class SummaryReader:
         """
         Read all summary file and save the info in instances
         """
+        self._locate_sections()
         self.dim_indices = self.read_dofs()
         dims = [len(self.dim_indices), 0, 0, 0]
         for dof in self.dim_indices:
@@ -606,3 +1639,4 @@ class SummaryReader:
             self._deformed[i].atoms = deformed[i]
 
         self._reference.dim_indices = self.dim_indices
+        self._reference.dof_index = DOFIndex(self.dim_indices)
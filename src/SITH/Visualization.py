@@ -648,11 +648,9 @@ class VisualizeEnergies(MoleculeViewer):
         div: int. Default: 5
             number of colors in the colorbar.
         """
-        energies = []
-        for dof in dofs:
-            for index, sithdof in enumerate(self.sith._reference.dim_indices):
-                if dof == sithdof:
-                    energies.append(self.sith.energies[index][self.idef])
+        rows = self.sith._reference.dof_index.rows(dofs)
+        energies = [self.sith.energies[index][self.idef]
+                    for index in rows if index >= 0]
 
         assert len(dofs) == len(energies), "The number of DOFs " + \
             f"({len(dofs)}) does not correspond with the number of " + \
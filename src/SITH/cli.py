@@ -0,0 +1,215 @@
+"""Command line batch runner for SITH analyses
+
+Each job is a reference geometry .fchk file and a deformed geometry .fchk file or directory of them. Jobs are analyzed
+across a pool of processes and all output files of each job (see SithWriter.write_all) are written in the parent
+directory of its reference geometry, prefixed with the names of its reference and deformed geometries.
+"""
+import argparse
+import glob
+import logging
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Tuple
+
+import numpy as np
+
+from SITH.SITH import SITH
+from SITH import SithWriter
+from SITH.Utilities import PhaseTimer
+
+logger = logging.getLogger(__name__)
+
+
+def read_manifest(manifest: str) -> list:
+    """Reads the jobs of a manifest file
+
+    Every non-empty line of the manifest holds the reference geometry path followed by the deformed geometry path,
+    separated by whitespace. Lines starting with '#' are ignored. Relative paths are taken relative to the manifest.
+
+    Args:
+        manifest (str): path to the manifest file
+
+    Returns:
+        list[tuple[Path, Path]]: (reference, deformed) paths of each job
+    """
+    manifest = Path(manifest)
+    jobs = list()
+    with open(manifest) as lines:
+        for number, line in enumerate(lines, start=1):
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            paths = line.split()
+            assert len(paths) == 2, f"Line {number} of {manifest} should hold a reference and a deformed path."
+            jobs.append(tuple(manifest.parent / path for path in paths))
+    return jobs
+
+
+def glob_jobs(pattern: str, deformed='deformed') -> list:
+    """Builds one job per reference geometry matching a glob pattern
+
+    Args:
+        pattern (str): glob pattern of reference geometry .fchk files, '**' matches any number of directories
+        deformed (str, optional): deformed geometry file or directory, relative to the directory of each reference.
+        Defaults to 'deformed'.
+
+    Returns:
+        list[tuple[Path, Path]]: (reference, deformed) paths of each job
+    """
+    references = sorted(Path(path) for path in glob.glob(pattern, recursive=True))
+    return [(reference, reference.parent / deformed) for reference in references]
+
+
+def output_prefix(job: Tuple[Path, Path]) -> str:
+    """Prefix of the output files of a job, unique among jobs sharing a reference directory
+
+    Args:
+        job (tuple[Path, Path]): reference and deformed geometry paths
+
+    Returns:
+        str: '<reference>-<deformed>-' without file extensions
+    """
+    return '-'.join(Path(path).stem for path in job) + '-'
+
+
+def run_job(job: Tuple[Path, Path], dtype=np.float64, packedHessian=False, cacheDir=None) -> dict:
+    """Extracts, analyzes and writes the output files of a single job
+
+    Args:
+        job (tuple[Path, Path]): reference and deformed geometry paths
+        dtype (numpy.dtype, optional): floating point precision of the analysis. Defaults to numpy.float64.
+        packedHessian (bool, optional): store Hessians in packed lower triangular storage. Defaults to False.
+        cacheDir (str, optional): directory of a SITH.Utilities.GeometryCache shared by all jobs. Defaults to None.
+
+    Returns:
+        dict: reference path, whether the job succeeded, its wall time in seconds, number of deformations analyzed,
+        the phases recorded by SITH.timings, and the error message of a failed job
+    """
+    reference, deformed = (Path(path).resolve() for path in job)
+    result = dict(reference=str(reference), success=False, seconds=0., deformations=0, timings=None, error=None)
+    start = time.perf_counter()
+    try:
+        sith = SITH(reference, deformed, dtype=dtype, packedHessian=packedHessian)
+        sith.extract_data(cacheDir=None if cacheDir is None else Path(cacheDir).resolve())
+        sith.analyze()
+        assert SithWriter.write_all(sith, output_prefix(job)), "Output files could not be written."
+        result['success'] = True
+        result['deformations'] = len(sith._deformed)
+        result['timings'] = sith.timings.phases
+    except (Exception, SystemExit) as error:
+        # extraction failures exit rather than raise, they should only fail their own job
+        result['error'] = f'{type(error).__name__}: {error}'
+    result['seconds'] = time.perf_counter() - start
+    return result
+
+
+def run_jobs(jobs: list, workers=1, **kwargs) -> list:
+    """Runs every job, concurrently if more than one worker is requested
+
+    Args:
+        jobs (list[tuple[Path, Path]]): reference and deformed geometry paths of each job
+        workers (int, optional): number of processes running jobs concurrently, None uses all available. Defaults to 1.
+        kwargs: passed on to run_job
+
+    Returns:
+        list[dict]: results of run_job, in the order of the jobs
+    """
+    if workers is None:
+        workers = os.cpu_count()
+    assert workers > 0, "Number of workers must be positive."
+    if workers == 1 or len(jobs) < 2:
+        return [run_job(job, **kwargs) for job in jobs]
+
+    results = list()
+    with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as executor:
+        futures = [executor.submit(run_job, job, **kwargs) for job in jobs]
+        for future in futures:
+            result = future.result()
+            logger.info(('Finished ' if result['success'] else 'Failed ') + result['reference'])
+            results.append(result)
+    return results
+
+
+def summarize(results: list, seconds: float) -> str:
+    """Formats the throughput summary of a batch
+
+    Args:
+        results (list[dict]): results of run_job
+        seconds (float): wall time of the whole batch
+
+    Returns:
+        str: summary of the batch, with the phases of all successful jobs added up
+    """
+    succeeded = [result for result in results if result['success']]
+    deformations = sum(result['deformations'] for result in succeeded)
+    lines = [f"{len(succeeded)} of {len(results)} jobs succeeded in {seconds:.2f} s",
+             f"{len(succeeded) / seconds if seconds else 0.:.2f} jobs/s, " +
+             f"{deformations / seconds if seconds else 0.:.2f} deformations/s"]
+    if succeeded:
+        lines.append(f"{sum(result['seconds'] for result in succeeded) / len(succeeded):.2f} s per successful job")
+        timings = PhaseTimer()
+        for result in succeeded:
+            for name, record in (result['timings'] or dict()).items():
+                timings.add(name, record['seconds'], record['bytes'], record['items'], record['calls'])
+        lines.append(timings.report())
+    lines += [f"{result['reference']}: {result['error']}" for result in results if not result['success']]
+    return '\n'.join(lines)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Builds the parser of the sith command
+
+    Returns:
+        argparse.ArgumentParser: parser of the command line arguments
+    """
+    parser = argparse.ArgumentParser(prog='sith', description="Run SITH analyses of many molecules in a batch.")
+    parser.add_argument('manifest', nargs='?', help="file listing one 'reference deformed' pair of paths per line")
+    parser.add_argument('-g', '--glob', help="glob pattern of reference .fchk files, used instead of a manifest")
+    parser.add_argument('-d', '--deformed', default='deformed',
+                        help="deformed file or directory relative to each globbed reference (default: deformed)")
+    parser.add_argument('-j', '--workers', type=int, default=1,
+                        help="number of jobs run concurrently, 0 uses all available processors (default: 1)")
+    parser.add_argument('--float32', action='store_true', help="analyze in single precision")
+    parser.add_argument('--packed', action='store_true', help="keep Hessians in packed lower triangular storage")
+    parser.add_argument('--cache-dir', help="directory of a geometry cache shared by all jobs")
+    parser.add_argument('-v', '--verbose', action='count', default=0,
+                        help="log the progress of each job, twice to log every step of the analysis")
+    return parser
+
+
+def main(argv=None) -> int:
+    """Entry point of the sith command
+
+    Args:
+        argv (list[str], optional): command line arguments. Defaults to sys.argv[1:].
+
+    Returns:
+        int: exit status, 0 if every job succeeded
+    """
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if (args.manifest is None) == (args.glob is None):
+        parser.error("give either a manifest or --glob")
+    if args.workers < 0:
+        parser.error("--workers must not be negative")
+    logging.basicConfig(level=max(logging.WARNING - 10 * args.verbose, logging.DEBUG),
+                        format='%(asctime)s %(processName)s %(name)s %(levelname)s: %(message)s')
+
+    jobs = read_manifest(args.manifest) if args.glob is None else glob_jobs(args.glob, args.deformed)
+    if not jobs:
+        print("No jobs to run.")
+        return 1
+
+    print(f"Running {len(jobs)} jobs...")
+    start = time.perf_counter()
+    results = run_jobs(jobs, workers=args.workers or None, dtype=np.float32 if args.float32 else np.float64,
+                       packedHessian=args.packed, cacheDir=args.cache_dir)
+    print(summarize(results, time.perf_counter() - start))
+    return 0 if all(result['success'] for result in results) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
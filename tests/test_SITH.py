@@ -1,7 +1,9 @@
+import json
 import os
 import pytest
 from pathlib import Path
 
+from benchmarks.synthetic import write_fchk_set
 from src.SITH.SITH import SITH
 from src.SITH.Utilities import *
 from tests.test_resources import *
@@ -147,6 +149,90 @@ def test_extract_dataDir():
     assert not sith._kill
 
 
+def test_extract_dataParallel():
+    serial = SITH('tests/glycine-ds-test/Gly-x0.fchk',
+                  'tests/glycine-ds-test/deformed')
+    serial.extract_data()
+    parallel = SITH('tests/glycine-ds-test/Gly-x0.fchk',
+                    'tests/glycine-ds-test/deformed')
+    with pytest.raises(Exception) as e:
+        parallel.extract_data(workers=0)
+    assert str(e.value) == "Number of workers must be positive."
+    parallel.extract_data(workers=3)
+    assert parallel.reference == serial.reference
+    assert [deformation.name for deformation in parallel.deformed] == \
+        [deformation.name for deformation in serial.deformed]
+    assert all([p == s for p, s in zip(parallel.deformed, serial.deformed)])
+    assert compare_arrays(parallel.deltaQ, serial.deltaQ)
+
+
+def test_extract_dataCached(tmp_path):
+    sith = SITH('tests/glycine-ds-test/Gly-x0.fchk',
+                'tests/glycine-ds-test/deformed')
+    sith.extract_data(cacheDir=tmp_path)
+    assert len(list(tmp_path.glob('*.npz'))) == 11
+    cached = SITH('tests/glycine-ds-test/Gly-x0.fchk',
+                  'tests/glycine-ds-test/deformed')
+    cached.extract_data(workers=2, cacheDir=tmp_path)
+    assert cached.reference == sith.reference
+    assert all([c == s for c, s in zip(cached.deformed, sith.deformed)])
+    assert compare_arrays(cached.deltaQ, sith.deltaQ)
+    # lazily loaded deformed Hessians are read through the section index stored in the cache
+    assert all([compare_arrays(c.hessian, s.hessian) for c, s in zip(cached.deformed, sith.deformed)])
+    assert len(list(tmp_path.glob('*.json'))) == 10
+
+
+def test_extract_dataMappedHessian(tmp_path):
+    sith = SITH('tests/glycine-ds-test/Gly-x0.fchk',
+                'tests/glycine-ds-test/deformed')
+    sith.extract_data()
+    sith.analyze()
+    mapped = SITH('tests/glycine-ds-test/Gly-x0.fchk',
+                  'tests/glycine-ds-test/deformed')
+    mapped.extract_data(hessianFile=tmp_path / 'hessian.npy')
+    assert isinstance(mapped.hessian, np.memmap)
+    assert compare_arrays(mapped.hessian, sith.hessian)
+    mapped.analyze()
+    assert compare_arrays(mapped.energies, sith.energies)
+    # the existing file is reused, with DOFs killed into a sibling file
+    killed = SITH('tests/glycine-ds-test/Gly-x0.fchk',
+                  'tests/glycine-ds-test/deformed', packedHessian=True)
+    killed.set_kill_dofs([(1, 2)])
+    killed.extract_data(hessianFile=tmp_path / 'packed.npy')
+    assert isinstance(killed.hessian.packed, np.memmap)
+    assert compare_arrays(killed.hessian.full_mat, sith.hessian[1:, 1:])
+    assert len(list(tmp_path.glob('packed-*.npy'))) == 1
+    assert list(tmp_path.glob('*.tmp')) == []
+    # an up to date file which does not match the reference DOFs is written again
+    np.save(tmp_path / 'other.npy', np.zeros((3, 3)))
+    other = SITH('tests/glycine-ds-test/Gly-x0.fchk',
+                 'tests/glycine-ds-test/deformed')
+    other.extract_data(hessianFile=tmp_path / 'other.npy')
+    assert compare_arrays(other.hessian, sith.hessian)
+    assert np.load(tmp_path / 'other.npy').shape == sith.hessian.shape
+
+
+def test_extract_dataSharedHessianFile(tmp_path):
+    # references of the same size sharing one file must each use their own Hessian
+    references = [write_fchk_set(tmp_path / name, 8, 20, 3, seed)[0] for name, seed in (('a', 1), ('b', 2))]
+    expected = list()
+    for reference in references:
+        sith = SITH(reference, reference.parent / 'deformed')
+        sith.extract_data()
+        sith.analyze()
+        expected.append(sith)
+    for _ in range(2):
+        for reference, sith in zip(references, expected):
+            mapped = SITH(reference, reference.parent / 'deformed')
+            mapped.extract_data(hessianFile=tmp_path / 'hessian.npy')
+            assert compare_arrays(mapped.hessian, sith.hessian)
+            mapped.analyze()
+            assert compare_arrays(mapped.energies, sith.energies)
+    assert json.loads((tmp_path / 'hessian.npy.json').read_text())['key'] == \
+        {'sha256': GeometryCache.fingerprint(references[1], np.float64)['sha256']}
+    assert list(tmp_path.glob('*.tmp')) == []
+
+
 def test_set_kill_dofs():
     sith = SITH(frankensteinPath, frankensteinPath)
     killDOFs = [(1, 2), (2, 1, 3)]
@@ -191,6 +277,82 @@ def test_killAtom():
     assert sith.deformed[0] == killedGeo
 
 
+def test_killAtomsAndDOFs():
+    # DOFs matched by several killed atoms or by both an atom and a DOF are only removed once
+    sith = SITH(frankensteinPath, frankensteinPath)
+    sith.set_kill_atoms([1, 2])
+    sith.set_kill_dofs([(1, 2), (5, 6)])
+    sith.extract_data()
+    keep = [not (1 in dof or 2 in dof or dof == (5, 6)) for dof in refGeo.dim_indices]
+    killedGeo = deepcopy(refGeo)
+    killedGeo._kill_DOFs(np.flatnonzero(np.logical_not(keep)))
+    assert sith.reference == killedGeo
+    assert sith.deformed[0] == killedGeo
+    assert compare_arrays(sith.hessian, np.asarray(refGeo.hessian)[np.ix_(keep, keep)])
+
+
+def test_kill_afterExtraction():
+    sith = SITH('tests/glycine-ds-test/Gly-x0.fchk',
+                'tests/glycine-ds-test/deformed')
+    sith.extract_data()
+    sith.analyze()
+    full = sith.energies
+    killed = SITH('tests/glycine-ds-test/Gly-x0.fchk',
+                  'tests/glycine-ds-test/deformed')
+    killed.set_kill_atoms([3])
+    killed.set_kill_dofs([(1, 2)])
+    killed.extract_data()
+    killed.analyze()
+
+    sith.set_kill_atoms([3])
+    sith.set_kill_dofs([(1, 2)])
+    sith.analyze()
+    assert sith.reference == killed.reference
+    assert all([s == k for s, k in zip(sith.deformed, killed.deformed)])
+    assert compare_arrays(sith.energies, killed.energies)
+    # the extracted data is untouched, so the kill set can be relaxed again
+    sith.set_kill_atoms([])
+    sith.set_kill_dofs([])
+    sith.analyze()
+    assert compare_arrays(sith.energies, full)
+
+
+def test_analyze_scenarios():
+    sith = SITH('tests/glycine-ds-test/Gly-x0.fchk',
+                'tests/glycine-ds-test/deformed')
+    sith.extract_data()
+    sith.analyze()
+    scenarios = [[], [(1, 2)], [3, (1, 2)]]
+    energies, deformationEnergy = sith.analyze_scenarios(scenarios)
+    assert energies.shape == (3,) + sith.energies.shape
+    assert deformationEnergy.shape == (3, sith.energies.shape[1])
+    assert compare_arrays(energies[0], sith.energies)
+    for scenario, scenarioEnergies, scenarioTotal in zip(scenarios[1:], energies[1:], deformationEnergy[1:]):
+        killed = SITH('tests/glycine-ds-test/Gly-x0.fchk',
+                      'tests/glycine-ds-test/deformed')
+        killed.set_kill_atoms([atom for atom in scenario if np.ndim(atom) == 0])
+        killed.set_kill_dofs([dof for dof in scenario if np.ndim(dof) == 1])
+        killed.extract_data()
+        killed.analyze()
+        rows = sith.reference.dof_index.rows(killed.reference.dim_indices)
+        assert compare_arrays(scenarioEnergies[rows], killed.energies)
+        assert np.all(np.delete(scenarioEnergies, rows, axis=0) == 0)
+        assert compare_arrays(scenarioTotal, killed.deformationEnergy[0])
+
+    # chunked mode fills deltaQ while setting up, so analyze() is not needed first
+    chunked = SITH('tests/glycine-ds-test/Gly-x0.fchk',
+                   'tests/glycine-ds-test/deformed')
+    chunked.set_chunking(3)
+    chunked.extract_data()
+    chunkedEnergies, chunkedTotal = chunked.analyze_scenarios(scenarios)
+    assert compare_arrays(chunkedEnergies, energies)
+    assert compare_arrays(chunkedTotal, deformationEnergy)
+
+    energies, deformationEnergy = sith.analyze_scenarios([])
+    assert energies.shape == (0,) + sith.energies.shape
+    assert deformationEnergy.shape == (0, sith.energies.shape[1])
+
+
 def test_kill_bad():
     sith = SITH(frankensteinPath, frankensteinPath)
     killDOFs = [(1, 19)]
@@ -242,6 +404,38 @@ def test_remove_extra_dofs_noKill():
     assert sith.deformed[0] == defd
 
 
+def test_remove_extra_dofs_reordered():
+    # deformed geometry lists the reference DOFs in another order, with an extra DOF
+    sith = SITH(frankensteinPath, frankensteinPath)
+    sith._reference = refGeo
+    shuffled = deepcopy(refGeo)
+    order = np.r_[[3, 0, 4, 2, 1], np.arange(5, refGeo.dims[0])[::-1]]
+    shuffled._reorder_DOFs(order)
+    shuffled.dim_indices = shuffled.dim_indices + [(2, 6)]
+    shuffled.ric = np.append(shuffled.ric, 1.0)
+    shuffled.dims[0] += 1
+    shuffled.dims[1] += 1
+    shuffled.hessian = np.pad(shuffled.hessian, (0, 1))
+    assert shuffled.dim_indices != refGeo.dim_indices
+    sith._deformed = [shuffled]
+    sith.remove_extra_dofs()
+    assert sith.deformed[0] == refGeo
+
+
+def test_deformedHessianLazy():
+    sith = SITH('tests/glycine-ds-test/Gly-x0.fchk',
+                'tests/glycine-ds-test/deformed/Gly-streched4.fchk')
+    sith.extract_data()
+    deformed = sith.deformed[0]
+    assert deformed._hessian is None
+    extractor = Extractor(sith._deformedPath, sith._deformedPath.read_text())
+    extractor._extract()
+    defd = extractor.get_geometry()
+    defd._kill_DOFs([4])
+    assert compare_arrays(deformed.hessian, defd.hessian)
+    assert deformed == defd
+
+
 def test_remove_extra_dofs_kill():
     # atoms specified for kill but should kill DOF (1, 16) from deformed cus not in reference
     sith = SITH('tests/glycine-ds-test/Gly-x0.fchk',
@@ -306,6 +500,13 @@ def test_populate_q():
     assert compare_arrays(sith.deltaQ, -np.transpose(coords2D)*0.5)
 
 
+def test_wrap_angles():
+    deltaQ = np.array([[4.0, -4.0], [0.5, -0.5], [1.9 * np.pi, -1.9 * np.pi]])
+    SITH._wrap_angles(deltaQ, 1)
+    assert compare_arrays(deltaQ, np.array(
+        [[4.0, -4.0], [0.5, -0.5], [0.1 * np.pi, -0.1 * np.pi]]))
+
+
 def test_analyze():
     sith = SITH(x0string, xFstring)
     sith.extract_data()
@@ -338,6 +539,110 @@ def test_analyze_Same():
     assert compare_arrays(sith.deformationEnergy, summation)
 
 
+def test_analyze_batched():
+    sith = SITH('tests/glycine-ds-test/Gly-x0.fchk',
+                'tests/glycine-ds-test/deformed')
+    sith.extract_data()
+    sith.analyze()
+    hessian = sith.hessian
+    for i in range(len(sith.deformed)):
+        dq = sith.deltaQ[:, i]
+        assert sith.deformationEnergy[0, i] == approx(0.5 * dq.dot(hessian).dot(dq))
+        for j in range(sith.reference.dims[0]):
+            isolatedDOF = np.zeros(sith.reference.dims[0])
+            isolatedDOF[j] = dq[j]
+            assert sith.energies[j, i] == approx(0.5 * isolatedDOF.dot(hessian).dot(dq))
+
+
+def test_analyze_chunked(tmp_path):
+    sith = SITH('tests/glycine-ds-test/Gly-x0.fchk',
+                'tests/glycine-ds-test/deformed')
+    sith.extract_data()
+    sith.analyze()
+
+    chunked = SITH('tests/glycine-ds-test/Gly-x0.fchk',
+                   'tests/glycine-ds-test/deformed')
+    with pytest.raises(Exception) as e:
+        chunked.set_chunking(0)
+    assert str(e.value) == "Chunk size must be a positive number of deformations."
+    chunked.set_chunking(3, tmp_path)
+    chunked.extract_data()
+    assert isinstance(chunked.deltaQ, np.memmap)
+    assert compare_arrays(chunked.qF, sith.qF)
+    # only the name, energy and dims of each deformed geometry are kept, the atoms are read again from its file
+    assert all([deformation.ric.size == 0 and deformation.hessian is None for deformation in chunked._deformed])
+    assert [deformation.energy for deformation in chunked._deformed] == [deformation.energy for deformation in sith._deformed]
+    assert chunked._deformed[1].atoms == sith._deformed[1].atoms
+    chunked.analyze()
+    assert isinstance(chunked.energies, np.memmap)
+    assert (tmp_path / 'energies.npy').exists()
+    assert compare_arrays(chunked.deltaQ, sith.deltaQ)
+    assert compare_arrays(chunked.energies, sith.energies)
+    assert compare_arrays(chunked.pEnergies, sith.pEnergies)
+    assert compare_arrays(chunked.deformationEnergy, sith.deformationEnergy)
+    assert compare_arrays(np.load(tmp_path / 'energies.npy'), sith.energies)
+
+
+def test_precision():
+    with pytest.raises(Exception) as e:
+        SITH(x0string, deformedString, dtype=np.int32)
+    assert str(e.value) == "Precision must be either numpy.float32 or numpy.float64."
+
+    double = SITH(x0string, deformedString)
+    double.extract_data()
+    double.analyze()
+    assert double.reference.ric.dtype == np.float64
+    assert double.hessian.dtype == np.float64
+    assert double.energies.dtype == np.float64
+
+    single = SITH(x0string, deformedString, dtype=np.float32)
+    single.extract_data()
+    single.analyze()
+    assert all([geometry.ric.dtype == np.float32 for geometry in [single.reference] + single.deformed])
+    assert single.hessian.dtype == np.float32
+    for result in (single.q0, single.qF, single.deltaQ, single.energies, single.deformationEnergy):
+        assert result.dtype == np.float32
+    assert np.allclose(single.energies, double.energies, rtol=1e-3, atol=1e-8)
+    assert np.allclose(single.deformationEnergy, double.deformationEnergy, rtol=1e-3)
+
+
+def test_packed_hessian_analysis():
+    sith = SITH(x0string, deformedString)
+    sith.set_kill_dofs([(1, 2)])
+    sith.extract_data()
+    sith.analyze()
+
+    packed = SITH(x0string, deformedString, packedHessian=True)
+    packed.set_kill_dofs([(1, 2)])
+    packed.extract_data()
+    assert not isinstance(packed.hessian, np.ndarray)
+    assert len(packed.hessian.packed) == 14 * 15 // 2
+    assert compare_arrays(packed.hessian.full_mat, sith.hessian)
+    packed.analyze()
+    assert compare_arrays(packed.energies, sith.energies)
+    assert compare_arrays(packed.deformationEnergy, sith.deformationEnergy)
+
+
+def test_sparse_analysis():
+    pytest.importorskip('scipy')
+    sith = SITH('tests/glycine-ds-test/Gly-x0.fchk',
+                'tests/glycine-ds-test/deformed')
+    sith.extract_data()
+    sith.analyze()
+    assert sith.hessianCutoffError is None
+    energies = np.copy(sith.energies)
+    deformationEnergy = np.copy(sith.deformationEnergy)
+
+    sith.analyze(hessianCutoff=0.)
+    assert compare_arrays(sith.energies, energies)
+    assert compare_arrays(sith.hessianCutoffError, np.zeros((1, 10)))
+
+    sith.analyze(hessianCutoff=1E-2)
+    assert sith.hessianCutoffError.shape == (1, 10)
+    assert all(np.abs(sith.deformationEnergy - deformationEnergy)[0] <= sith.hessianCutoffError[0])
+    assert compare_arrays(np.sum(sith.pEnergies, axis=0), np.full(10, 100.))
+
+
 # region Integration Tests and Examples
 
 def test_full_killed():  # full with no mismatched, kill valid, deformed directory, just check doesn't crash
@@ -419,3 +724,26 @@ def test_movedx0():
 
 
 # endregion
+
+
+def test_timings():
+    sith = SITH(x0string, deformedString)
+    sith.set_kill_dofs([(1, 2)])
+    sith.extract_data(workers=2)
+    sith.analyze()
+    assert write_dof_energies(sith, 'timings-')
+    Path('tests/timings-dof_energies.txt').unlink()
+
+    files = [sith._referencePath] + list(sith._deformedPath.glob('*.fchk'))
+    assert sith.timings['read']['bytes'] == sum([file.stat().st_size for file in files])
+    assert sith.timings['read']['items'] == sith.timings['parse']['items'] == len(files)
+    assert sith.timings['kill']['items'] == 1
+    assert all([sith.timings[phase]['items'] == 5 for phase in ('align', 'validate', 'populate_q', 'analyze')])
+    assert sith.timings['write']['items'] == 1 and sith.timings['write']['bytes'] > 0
+    assert all([record['seconds'] >= 0 for record in sith.timings.phases.values()])
+    assert list(sith.timings.phases) == ['read', 'parse', 'kill', 'align', 'validate', 'populate_q', 'analyze', 'write']
+
+    sith.set_kill_dofs([(1, 2), sith.reference.dim_indices[0]])
+    sith.analyze()
+    assert sith.timings['kill']['calls'] == 2 and sith.timings['kill']['items'] == 3
+    assert sith.timings['analyze']['items'] == 10
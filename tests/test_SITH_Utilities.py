@@ -1,20 +1,109 @@
 from curses.ascii import SI
+import io
 from numpy import float32
 import pytest
 from pytest import approx
 from ase import Atom
 
-from src.SITH.Utilities import Extractor, Geometry, UnitConverter, SummaryReader
+from src.SITH.Utilities import Extractor, Geometry, UnitConverter, SummaryReader, PackedHessian, LTMatrix, SparseHessian, GeometryCache, DOFIndex, FchkIndex, PhaseTimer, TimedReader
 from src.SITH.SITH import SITH
 from tests.test_resources import *
 from ase import Atom
 from ase import units
-from src.SITH.SithWriter import write_summary
+from src.SITH.SithWriter import write_summary, write_binary_summary
 
 """ LTMatrix has already been tested by its creator on github,
  but should add in their testing just in case """
 
 
+# region LTMatrix Tests
+
+
+def test_ltmatrix_full_mat():
+    lt = LTMatrix(ehRaw)
+    assert compare_arrays(lt.full_mat, eHessFull)
+    assert lt.full_mat is lt.full_mat
+    assert lt[3, 1] == lt[1, 3] == ehRaw[LTMatrix.get_position(3, 1)]
+
+
+def test_ltmatrix_upper_mat():
+    lt = LTMatrix(list(range(21)))
+    assert lt.uppermat() == [0, 1, 3, 6, 10, 15, 2, 4, 7, 11, 16, 5, 8, 12, 17, 9, 13, 18, 14, 19, 20]
+    assert LTMatrix.new_from_upper_mat(lt.uppermat()) == lt
+    assert np.array_equal(LTMatrix.new_from_upper_mat(lt.uppermat()).full_mat, lt.full_mat)
+
+# endregion
+
+# region PackedHessian Tests
+
+
+def test_packed_hessian():
+    packed = PackedHessian(ehRaw)
+    assert packed.shape == (15, 15)
+    assert compare_arrays(packed.full_mat, eHessFull)
+    assert np.array_equal(packed, eHessFull)
+    vector = np.arange(15, dtype=float) - 7
+    assert compare_arrays(packed @ vector, eHessFull @ vector)
+    matrix = np.reshape(np.linspace(-1, 1, 45), (15, 3))
+    assert compare_arrays(packed @ matrix, eHessFull @ matrix)
+    with pytest.raises(Exception) as e:
+        PackedHessian(ehRaw[1:])
+    assert str(e.value) == "Not a LTMatrix"
+
+
+def test_packed_hessian_blocks():
+    packed = PackedHessian(ehRaw)
+    packed.block_elements = 20
+    matrix = np.reshape(np.linspace(-1, 1, 45), (15, 3))
+    assert compare_arrays(packed @ matrix, eHessFull @ matrix)
+
+
+def test_packed_hessian_delete():
+    packed = PackedHessian(ehRaw)
+    assert compare_arrays(packed.delete([0]).full_mat, eHessKill0)
+    assert compare_arrays(packed.delete([0, 14]).full_mat, eHessKill0_14)
+    assert packed.delete([0, 14]).dimension == 13
+
+
+def test_packed_hessian_take():
+    packed = PackedHessian(ehRaw)
+    rows = [14, 3, 0, 7]
+    assert compare_arrays(packed.take(rows).full_mat, np.asarray(eHessFull)[np.ix_(rows, rows)])
+
+# endregion
+
+# region SparseHessian Tests
+
+
+def test_sparse_hessian(monkeypatch):
+    pytest.importorskip('scipy')
+    sparse = SparseHessian(eHessFull, 0.)
+    assert sparse.dropped_norm == 0
+    assert compare_arrays(sparse.full_mat, eHessFull)
+    assert compare_arrays(SparseHessian(PackedHessian(ehRaw), 0.).full_mat, eHessFull)
+    assert compare_arrays(SparseHessian(LTMatrix(list(ehRaw)), 0.).full_mat, eHessFull)
+
+    cutoff = 1E-2
+    sparse = SparseHessian(PackedHessian(ehRaw), cutoff)
+    dropped = np.where(np.abs(eHessFull) < cutoff, eHessFull, 0.)
+    np.fill_diagonal(dropped, 0.)
+    assert compare_arrays(sparse.full_mat, eHessFull - dropped)
+    assert sparse.dropped_norm == approx(np.linalg.norm(dropped))
+    assert sparse.matrix.nnz == np.count_nonzero(eHessFull - dropped)
+    matrix = np.reshape(np.linspace(-1, 1, 45), (15, 3))
+    assert compare_arrays(sparse @ matrix, (eHessFull - dropped) @ matrix)
+    # thresholding a few rows at a time gives the same matrix
+    monkeypatch.setattr(PackedHessian, 'block_elements', 40)
+    for hessian in (PackedHessian(ehRaw), eHessFull):
+        blocked = SparseHessian(hessian, cutoff)
+        assert compare_arrays(blocked.full_mat, eHessFull - dropped)
+        assert blocked.dropped_norm == approx(sparse.dropped_norm)
+    with pytest.raises(Exception) as e:
+        SparseHessian(eHessFull, -1.)
+    assert str(e.value) == "Hessian cutoff must not be negative."
+
+# endregion
+
 # region Geometry Tests
 
 
@@ -42,6 +131,30 @@ def test_build_RICGood():
     assert compare_arrays(geo.ric, coords)
 
 
+def test_dof_index():
+    geo = deepcopy(refGeo)
+    assert geo.dof_index[dim_indices[3]] == 3
+    assert compare_arrays(geo.dof_index.rows([dim_indices[5], (6, 5), dim_indices[0]]), np.array([5, -1, 0]))
+    geo._kill_DOFs([0, 1])
+    assert geo.dof_index[dim_indices[3]] == 1
+    assert dim_indices[0] not in geo.dof_index
+    assert DOFIndex(dim_indices) == refGeo.dof_index
+    with pytest.raises(Exception) as e:
+        DOFIndex([(1, 2**16, 0, 0)])
+    assert str(e.value) == "Atom indices of DOFs must be between 0 and 65535 to be indexed."
+
+
+def test_compact_geometry():
+    geo = deepcopy(refGeo)
+    assert geo.dim_indices_array.shape == (len(dim_indices), 4)
+    assert geo.dim_indices_array.dtype == np.int32
+    assert compare_arrays(geo.dim_indices_array[5], np.array([2, 1, 3, 0]))
+    assert geo.dim_indices == dim_indices
+    assert compare_arrays(geo.offsets, np.cumsum([0, dims[1], dims[2], dims[3]]))
+    with pytest.raises(AttributeError):
+        geo.unknown = 1
+
+
 def test_equals():
     geoCopy = deepcopy(refGeo)
     assert geoCopy == refGeo
@@ -66,7 +179,7 @@ def test_equals():
     geoCopy.ric[2] = 26
     assert geoCopy != refGeo
     geoCopy.ric = refGeo.ric
-    geoCopy.dim_indices[2] = (1, 2)
+    geoCopy.dim_indices = geoCopy.dim_indices[:2] + [(1, 2)] + geoCopy.dim_indices[3:]
     assert geoCopy != refGeo
 
 
@@ -217,6 +330,18 @@ def test_extract():
     assert compare_arrays(np.array(extractor.h_raw), ehRaw)
 
 
+def test_extractStreamed():
+    listed = Extractor(testPath, frankenNoLines)
+    listed._extract()
+    with open(frankensteinPath) as file:
+        streamed = Extractor(testPath, file)
+        assert streamed._extract()
+    assert streamed.get_geometry() == listed.get_geometry()
+    buffered = Extractor(testPath, '\n'.join(frankenNoLines))
+    assert buffered._extract()
+    assert buffered.get_geometry() == listed.get_geometry()
+
+
 def test_extractedGeometry():
     extractor = Extractor(Path(
         '/hits/fast/mbm/farrugma/sw/SITH/tests/frankenTest-methanol.fchk'), frankenNoLines)
@@ -246,6 +371,89 @@ def test_buildHessian():
     assert compare_arrays(eHessFull, hess)
 
 
+def test_buildPackedHessian():
+    extractor = Extractor(testPath, frankenNoLines, packedHessian=True)
+    extractor._extract()
+    assert isinstance(extractor.hessian, PackedHessian)
+    assert compare_arrays(extractor.hessian.full_mat, eHessFull)
+    geo = extractor.get_geometry()
+    geo._kill_DOFs([0, 14])
+    assert isinstance(geo.hessian, PackedHessian)
+    assert compare_arrays(geo.hessian.full_mat, eHessKill0_14)
+
+
+def test_geometry_cache(tmp_path):
+    fchk = tmp_path / 'methanol.fchk'
+    fchk.write_text(Path(frankensteinPath).read_text())
+    cache = GeometryCache(tmp_path / 'cache')
+    assert cache.load(fchk) is None
+
+    extractor = Extractor(fchk, fchk.read_text())
+    extractor._extract()
+    geometry = extractor.get_geometry()
+    cache.store(fchk, geometry)
+    assert len(list((tmp_path / 'cache').glob('*.npz'))) == 1
+    assert cache.load(fchk) == geometry
+    packed = cache.load(fchk, packedHessian=True)
+    assert isinstance(packed.hessian, PackedHessian)
+    assert compare_arrays(packed.hessian.full_mat, geometry.hessian)
+    assert cache.load(fchk, dtype=np.float32) is None
+
+    with fchk.open('a') as file:
+        file.write('\n')
+    assert cache.load(fchk) is None
+
+
+def test_geometry_cacheNoAtoms(tmp_path):
+    # a file without cartesian coordinates extracts to a geometry whose atoms are an empty list
+    lines = Path(frankensteinPath).read_text().splitlines(keepends=True)
+    start = [i for i, line in enumerate(lines) if line.startswith('Current cartesian coordinates')][0]
+    fchk = tmp_path / 'methanol.fchk'
+    fchk.write_text(''.join(lines[:start] + lines[start + 5:]))
+    extractor = Extractor(fchk, fchk.read_text())
+    extractor._extract()
+    geometry = extractor.get_geometry()
+    assert geometry.atoms == list()
+
+    cache = GeometryCache(tmp_path / 'cache')
+    cache.store(fchk, geometry)
+    cached = cache.load(fchk)
+    assert cached == geometry
+    assert cached.atoms == list()
+
+
+def test_kill_mappedHessian(tmp_path):
+    extractor = Extractor(testPath, frankenNoLines)
+    extractor._extract()
+    geometry = extractor.get_geometry()
+    expected = np.delete(np.delete(geometry.hessian, [0, 2], 0), [0, 2], 1)
+    np.save(tmp_path / 'hessian.npy', geometry.hessian)
+    geometry.hessian = np.load(tmp_path / 'hessian.npy', mmap_mode='r')
+    geometry._kill_DOFs([0, 2])
+    assert isinstance(geometry.hessian, np.memmap)
+    assert compare_arrays(geometry.hessian, expected)
+    assert len(list(tmp_path.glob('hessian-*.npy'))) == 1
+
+
+def test_fchk_index(tmp_path):
+    fchk = tmp_path / 'methanol.fchk'
+    fchk.write_text(Path(frankensteinPath).read_text())
+    extractor = Extractor(fchk, fchk.read_text())
+    extractor._extract()
+    geometry = extractor.get_geometry()
+
+    index = FchkIndex.open(fchk, tmp_path / 'methanol.json')
+    assert index.read('Number of atoms') == 6
+    assert index.read('Full Title').startswith('Title Card Required')
+    assert compare_arrays(index.read('Redundant internal coordinates'), geometry.ric)
+    assert compare_arrays(index.read('Redundant internal dimensions'), np.array(geometry.dims))
+    assert 'Internal Force Constants' in index
+    stored = FchkIndex.open(fchk, tmp_path / 'methanol.json')
+    assert stored.sections == index.sections
+    assert compare_arrays(Extractor.read_hessian(fchk, indexPath=tmp_path / 'methanol.json'), geometry.hessian)
+    assert compare_arrays(Extractor.read_hessian(fchk), geometry.hessian)
+
+
 def test_getGeometry():
     extractor = Extractor(testPath, frankenNoLines)
     egeo = Geometry('testName', 'blah', 3)
@@ -314,3 +522,56 @@ def test_summary_reader():
         assert sith_result._deformed[i].atoms.positions == approx(sith._deformed[i].atoms.positions)
         assert (sith_result._deformed[i].atoms.get_atomic_numbers() == 
                 sith._deformed[i].atoms.get_atomic_numbers()).all()
+
+
+def test_binary_summary_reader():
+    sith = SITH(x0string, deformedString)
+    sith.extract_data()
+    sith.analyze()
+    write_summary(sith, includeXYZ=True)
+    assert write_binary_summary(sith)
+    path = sith._referencePath.parent.as_posix()+sith._referencePath.root
+
+    text = SummaryReader(path + 'summary.txt')
+    binary = SummaryReader(path + 'summary.sith')
+    assert 'deltaQ' not in vars(binary)
+    assert isinstance(binary.deltaQ, np.memmap)
+    assert binary.dim_indices == text.dim_indices == sith._reference.dim_indices
+    assert (binary._reference.dims == text._reference.dims).all()
+    assert binary.deltaQ == approx(text.deltaQ, abs=1e-5)
+    assert binary.energies == approx(sith.energies)
+    assert binary.deformationEnergy == approx(sith.deformationEnergy)
+    assert binary.accuracy[:2] == approx(text.accuracy[:2])
+    assert binary.accuracy[2] == approx(text.accuracy[2], abs=0.01)
+    assert binary.accuracy[3] == approx(text.accuracy[3])
+    assert list(binary.names) == [sith._reference.name] + [d.name for d in sith._deformed]
+    assert binary._reference.dof_index.rows(sith._reference.dim_indices[:2]).tolist() == [0, 1]
+    assert len(binary._deformed) == len(text._deformed)
+    for b, t in zip([binary._reference] + binary._deformed, [text._reference] + text._deformed):
+        assert b.atoms.positions == approx(t.atoms.positions, abs=1e-5)
+        assert (b.atoms.get_atomic_numbers() == t.atoms.get_atomic_numbers()).all()
+
+
+def test_phase_timer():
+    timings = PhaseTimer()
+    with timings.phase('read', items=1, nbytes=10) as record:
+        record['items'] += 2
+    timings.add('parse', 0.5, items=3)
+    other = PhaseTimer()
+    other.add('parse', 0.25, 4, 1)
+    other.add('write', 1.)
+    timings.merge(other)
+    assert list(timings.phases) == ['read', 'parse', 'write']
+    assert timings['read']['items'] == 3 and timings['read']['bytes'] == 10 and timings['read']['calls'] == 1
+    assert timings['parse'] == {'seconds': 0.75, 'bytes': 4, 'items': 4, 'calls': 2}
+    assert 'write' in timings and 'kill' not in timings
+    assert len(timings.report().splitlines()) == 4
+
+
+def test_timed_reader():
+    path = Path(x0string)
+    with TimedReader(path.open('rb', buffering=0)) as reader, io.TextIOWrapper(io.BufferedReader(reader)) as file:
+        lines = file.readlines()
+    assert lines == path.read_text().splitlines(keepends=True)
+    assert reader.bytes == path.stat().st_size
+    assert reader.seconds >= 0 and reader.closed
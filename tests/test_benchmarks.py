@@ -0,0 +1,34 @@
+from benchmarks.run import compare
+from benchmarks.synthetic import dof_counts, write_fchk_set
+from src.SITH.SITH import SITH
+from src.SITH.Utilities import Extractor, FchkIndex
+from tests.test_resources import *
+
+
+def test_synthetic_fchk(tmp_path):
+    reference, deformed = write_fchk_set(tmp_path, 8, 20, 3, seed=4)
+    assert len(list(deformed.glob('*.fchk'))) == 3
+    assert 'Internal Force Constants' not in FchkIndex(next(deformed.glob('*.fchk')))
+
+    sith = SITH(reference, deformed)
+    sith.extract_data()
+    sith.analyze()
+    assert compare_arrays(np.array(sith.reference.dims), np.array([20, *dof_counts(20)]))
+    assert len(set(sith.reference.dim_indices)) == 20
+    hessian = Extractor.read_hessian(reference, np.float64, False)
+    assert compare_arrays(hessian, hessian.T)
+    assert np.all(np.diag(hessian) > np.sum(np.abs(hessian), axis=1) - np.diag(hessian))
+    assert sith.energies.shape == (20, 3) and np.all(np.isfinite(sith.energies))
+    # larger deformations have larger stress energies
+    assert np.all(np.diff(sith.deformationEnergy[0]) > 0)
+
+    again, _ = write_fchk_set(tmp_path / 'again', 8, 20, 3, seed=4)
+    assert again.read_text() == reference.read_text()
+
+
+def test_compare_baselines():
+    baselines = {'case': {'extract': 1.0, 'analyze': 1e-4}}
+    results = {'case': {'extract': 1.6, 'analyze': 5e-4, 'full_mat': 9.}, 'new': {'extract': 1.}}
+    regressions = compare(results, baselines, 1.5)
+    assert len(regressions) == 1 and regressions[0].startswith('case extract')
+    assert compare(results, baselines, 2.) == []
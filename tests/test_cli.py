@@ -0,0 +1,58 @@
+import pytest
+
+from src.SITH.cli import *
+from src.SITH.SITH import SITH
+from src.SITH.SithWriter import write_dof_energies
+from tests.test_resources import *
+
+
+def test_read_manifest(tmp_path):
+    manifest = tmp_path / 'jobs.txt'
+    manifest.write_text("# reference deformed\n\nmols/x0.fchk mols/deformed\n/abs/a.fchk /abs/b.fchk\n")
+    jobs = read_manifest(manifest)
+    assert jobs == [(tmp_path / 'mols/x0.fchk', tmp_path / 'mols/deformed'),
+                    (Path('/abs/a.fchk'), Path('/abs/b.fchk'))]
+
+    manifest.write_text("x0.fchk\n")
+    with pytest.raises(AssertionError):
+        read_manifest(manifest)
+
+
+def test_glob_jobs():
+    jobs = glob_jobs('tests/x*.fchk')
+    assert jobs == [(Path('tests/x0.fchk'), Path('tests/deformed')), (Path('tests/xF.fchk'), Path('tests/deformed'))]
+    assert output_prefix(jobs[0]) == 'x0-deformed-'
+
+
+def test_run_jobs():
+    jobs = [(Path(x0string), Path(deformedString)), (Path(x0string), Path(xFstring)), (Path(x0string), Path(dnePath))]
+    results = run_jobs(jobs, workers=2)
+    try:
+        assert [result['success'] for result in results] == [True, True, False]
+        assert [result['deformations'] for result in results] == [5, 1, 0]
+        assert results[2]['error'] is not None
+
+        sith = SITH(x0string, deformedString)
+        sith.extract_data()
+        sith.analyze()
+        assert write_dof_energies(sith, 'direct-')
+        assert Path('tests/x0-deformed-dof_energies.txt').read_text() == Path('tests/direct-dof_energies.txt').read_text()
+        assert '2 of 3 jobs succeeded' in summarize(results, 1.)
+    finally:
+        Path('tests/direct-dof_energies.txt').unlink(missing_ok=True)
+        for job in jobs[:2]:
+            for output in Path('tests').glob(output_prefix(job) + '*'):
+                output.unlink()
+
+
+def test_main(tmp_path):
+    manifest = tmp_path / 'jobs.txt'
+    manifest.write_text(f"{Path(x0string).resolve()} {Path(xFstring).resolve()}\n")
+    try:
+        assert main([str(manifest)]) == 0
+        assert Path('tests/x0-xF-summary.txt').exists()
+    finally:
+        for output in Path('tests').glob('x0-xF-*'):
+            output.unlink()
+    with pytest.raises(SystemExit):
+        main([])